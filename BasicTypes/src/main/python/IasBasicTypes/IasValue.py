@@ -3,7 +3,26 @@ Created on Jun 7, 2018
 
 @author: acaproni
 '''
-import json
+import mmap
+import os
+import re
+
+# Use the fastest JSON library available
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumpsBytes = orjson.dumps
+    def _dumps(obj):
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
+    _loads = _json.loads
+    _dumps = _json.dumps
+    def _dumpsBytes(obj):
+        return _json.dumps(obj).encode("utf-8")
 
 from IasBasicTypes.Alarm import Alarm
 from IasBasicTypes.IasType import IASType
@@ -11,6 +30,33 @@ from IasBasicTypes.Iso8601TStamp import Iso8601TStamp
 from IasBasicTypes.OperationalMode import OperationalMode
 from IasBasicTypes.Validity import Validity
 
+def _lazyTStamp(strAttr, cacheAttr):
+    """
+    Build the property of a timestamp as datetime that is converted
+    from the ISO 8601 string only when read for the first time
+    
+    @param strAttr: the attribute with the ISO 8601 string
+    @param cacheAttr: the attribute where the datetime is cached
+    @return the property of the timestamp
+    """
+    def getter(self):
+        tStamp = getattr(self, cacheAttr)
+        if tStamp is None:
+            tStampStr = getattr(self, strAttr)
+            if tStampStr is not None:
+                tStamp = Iso8601TStamp.Iso8601ToDatetime(tStampStr)
+                setattr(self, cacheAttr, tStamp)
+        return tStamp
+    
+    def setter(self, tStamp):
+        setattr(self, cacheAttr, tStamp)
+    
+    return property(getter, setter)
+
+# The ID of the IASIO in the last part of the full running ID,
+# like (AlarmType-ID:IASIO): as in the java Identifier, the IDs
+# cannot contain '@', ':', '(' and ')'
+_FRID_RE = re.compile(r"(?:^|@)\(([^@:()]+):IASIO\)$")
 
 class IasValue(object):
     '''
@@ -21,104 +67,70 @@ class IasValue(object):
     the mode is present as string or as OperationalMode
     '''
     
-    # The value
-    value = None
-    
-    # The point in time when the plugin produced this value
-    # as ISO 8601 string
-    pluginProductionTStampStr = None
-    
-    # The point in time when the plugin produced this value
-    # as datetime
-    pluginProductionTStamp = None
-    
-    # The point in time when the plugin sent the 
-    # value to the converter
-    # as ISO 8601 string
-    sentToConverterTStampStr = None
-    
-    # The point in time when the plugin sent the 
-    # value to the converter
-    # as datetime
-    sentToConverterTStamp = None
-    
-    # The point in time when the converter received the  
-    # value from the plugin
-    # as ISO 8601 string
-    receivedFromPluginTStampStr = None
-    
-    # The point in time when the converter received the  
-    # value from the plugin
-    # as datetime
-    receivedFromPluginTStamp = None
-    
-    # The point in time when the converter generated
-    # the value from the data structure received by the plugin
-    # as ISO 8601 string
-    convertedProductionTStampStr = None
-    
-    # The point in time when the converter generated
-    # the value from the data structure received by the plugin
-    # as datetime
-    convertedProductionTStamp = None
-    
-    # The point in time when the value has been sent to the BSDB
-    # as ISO 8601 string
-    sentToBsdbTStampStr = None
-    
-    # The point in time when the value has been sent to the BSDB
-    # as datetime
-    sentToBsdbTStamp = None
-    
-    # The point in time when the value has been read from the BSDB
-    # as ISO 8601 string
-    readFromBsdbTStampStr = None
-    
-    # The point in time when the value has been read from the BSDB
-    # as datetime
-    readFromBsdbTStamp = None
-    
-    # The point in time when the value has been
-    # generated by the DASU
-    # as ISO 8601 string
-    dasuProductionTStampStr = None
-    
-    # The point in time when the value has been
-    # generated by the DASU
-    # as datetime
-    dasuProductionTStamp= None
-    
-    # The string representation of the mode of the input
-    modeStr = None
-    
-    # The OperationalMode of the input
-    mode = None
-    
-    # The validity
-    iasValidityStr = None
-    
-    # The validity
-    iasValidity = None
-    
-    # The identifier of the input
-    id = None
-    
-    # The full identifier of the input concatenated with
-    # that of its parents.
-    fullRunningId = None
-    
-    # The string representation of the IAS type of this input.
-    valueTypeStr = None
-    
-    # The IAS type of this input.
-    valueType = None
-    
-    # The full running identifiers of the dependent
-    # monitor point 
-    dependentsFullRuningIds = None
-    
-    # The additional properties
-    props = None
+    # IasValues are built for each value read from the BSDB:
+    # slots save the memory of the dictionary of each instance
+    __slots__ = (
+        # The value
+        "value",
+        # The points in time when the value has been produced,
+        # sent and received by the IAS components
+        # as ISO 8601 string and the cache of the datetime
+        # returned by the properties defined below:
+        # - produced by the plugin
+        "pluginProductionTStampStr", "_pluginProductionTStamp",
+        # - sent by the plugin to the converter
+        "sentToConverterTStampStr", "_sentToConverterTStamp",
+        # - received by the converter from the plugin
+        "receivedFromPluginTStampStr", "_receivedFromPluginTStamp",
+        # - generated by the converter from the data structure received by the plugin
+        "convertedProductionTStampStr", "_convertedProductionTStamp",
+        # - sent to the BSDB
+        "sentToBsdbTStampStr", "_sentToBsdbTStamp",
+        # - read from the BSDB
+        "readFromBsdbTStampStr", "_readFromBsdbTStamp",
+        # - generated by the DASU
+        "dasuProductionTStampStr", "_dasuProductionTStamp",
+        # The operational mode of the input as string and as OperationalMode
+        "modeStr", "mode",
+        # The validity as string and as Validity
+        "iasValidityStr", "iasValidity",
+        # The identifier of the input
+        "id",
+        # The full identifier of the input concatenated with
+        # that of its parents.
+        "fullRunningId",
+        # The IAS type of this input as string and as IASType
+        "valueTypeStr", "valueType",
+        # The full running identifiers of the dependent
+        # monitor point
+        "dependentsFullRuningIds",
+        # The additional properties
+        "props")
+    
+    # The timestamps as datetime: the ISO 8601 strings
+    # are converted only if and when the timestamps are read
+    pluginProductionTStamp = _lazyTStamp("pluginProductionTStampStr", "_pluginProductionTStamp")
+    sentToConverterTStamp = _lazyTStamp("sentToConverterTStampStr", "_sentToConverterTStamp")
+    receivedFromPluginTStamp = _lazyTStamp("receivedFromPluginTStampStr", "_receivedFromPluginTStamp")
+    convertedProductionTStamp = _lazyTStamp("convertedProductionTStampStr", "_convertedProductionTStamp")
+    sentToBsdbTStamp = _lazyTStamp("sentToBsdbTStampStr", "_sentToBsdbTStamp")
+    readFromBsdbTStamp = _lazyTStamp("readFromBsdbTStampStr", "_readFromBsdbTStamp")
+    dasuProductionTStamp = _lazyTStamp("dasuProductionTStampStr", "_dasuProductionTStamp")
+    
+    # The timestamps in the JSON string as tuples of
+    # (attribute with the ISO 8601 string, JSON key)
+    _TS_FIELDS = (
+        ("pluginProductionTStampStr", "pluginProductionTStamp"),
+        ("sentToConverterTStampStr", "sentToConverterTStamp"),
+        ("receivedFromPluginTStampStr", "receivedFromPluginTStamp"),
+        ("convertedProductionTStampStr", "convertedProductionTStamp"),
+        ("sentToBsdbTStampStr", "sentToBsdbTStamp"),
+        ("readFromBsdbTStampStr", "readFromBsdbTStamp"),
+        ("dasuProductionTStampStr", "dasuProductionTStamp"))
+    
+    # The optional fields of the JSON string as tuples of (JSON key, attribute)
+    _OPT_KEYS = (("depsFullRunningIds", "dependentsFullRuningIds"), ("props", "props")) + \
+        tuple((jsonKey, strAttr) for strAttr, jsonKey in _TS_FIELDS)
     
     def __init__(self, 
                  value,
@@ -135,6 +147,16 @@ class IasValue(object):
         @parm mode the operational mode (string or OperationalMode)
         @param iasValidity the validity (string or Validity)
         '''
+        self.dependentsFullRuningIds = None
+        self.props = None
+        self.pluginProductionTStampStr = self._pluginProductionTStamp = None
+        self.sentToConverterTStampStr = self._sentToConverterTStamp = None
+        self.receivedFromPluginTStampStr = self._receivedFromPluginTStamp = None
+        self.convertedProductionTStampStr = self._convertedProductionTStamp = None
+        self.sentToBsdbTStampStr = self._sentToBsdbTStamp = None
+        self.readFromBsdbTStampStr = self._readFromBsdbTStamp = None
+        self.dasuProductionTStampStr = self._dasuProductionTStamp = None
+        
         if not value:
             raise ValueError("Invalid value")
         self.value = value
@@ -176,9 +198,9 @@ class IasValue(object):
         '''
         Factory method to build a IasValue for a JSON string
         
-        @param jsonStr the json string representing the IASValue
+        @param jsonStr the json string (or UTF-8 encoded bytes) representing the IASValue
         '''
-        fromJsonDict = json.loads(jsonStr)
+        fromJsonDict = _loads(jsonStr)
         
         value = fromJsonDict["value"]
         valueTypeStr = fromJsonDict["valueType"]
@@ -193,54 +215,60 @@ class IasValue(object):
         
         iasValue = IasValue(value,valueType,fullRunningId,modeStr,iasValidityStr)
         
-        iasValue.dependentsFullRuningIds = IasValue.getValue(fromJsonDict,"depsFullRunningIds")
-        iasValue.props = IasValue.getValue(fromJsonDict,"props")
-    
-        iasValue.pluginProductionTStampStr = IasValue.getValue(fromJsonDict,"pluginProductionTStamp")
-        if iasValue.pluginProductionTStampStr is not None:
-            iasValue.pluginProductionTStamp=Iso8601TStamp.Iso8601ToDatetime(iasValue.pluginProductionTStampStr)
-            
-        iasValue.sentToConverterTStampStr = IasValue.getValue(fromJsonDict,"sentToConverterTStamp")
-        if iasValue.sentToConverterTStampStr is not None:
-            iasValue.sentToConverterTStamp=Iso8601TStamp.Iso8601ToDatetime(iasValue.sentToConverterTStampStr)
-            
-        iasValue.receivedFromPluginTStampStr = IasValue.getValue(fromJsonDict,"receivedFromPluginTStamp")
-        if iasValue.receivedFromPluginTStampStr is not None:
-            iasValue.receivedFromPluginTStamp=Iso8601TStamp.Iso8601ToDatetime(iasValue.receivedFromPluginTStampStr)
+        get = fromJsonDict.get
+        iasValue.dependentsFullRuningIds = get("depsFullRunningIds")
+        iasValue.props = get("props")
+        
+        # The timestamps are converted to datetime when read
+        for strAttr, jsonKey in IasValue._TS_FIELDS:
+            tStampStr = get(jsonKey)
+            if tStampStr is not None:
+                setattr(iasValue, strAttr, tStampStr)
             
-        iasValue.convertedProductionTStampStr = IasValue.getValue(fromJsonDict,"convertedProductionTStamp")
-        if iasValue.convertedProductionTStampStr is not None:
-            iasValue.convertedProductionTStamp=Iso8601TStamp.Iso8601ToDatetime(iasValue.convertedProductionTStampStr)
+        return iasValue
         
-        iasValue.sentToBsdbTStampStr = IasValue.getValue(fromJsonDict,"sentToBsdbTStamp")
-        if iasValue.sentToBsdbTStampStr is not None:
-            iasValue.sentToBsdbTStamp=Iso8601TStamp.Iso8601ToDatetime(iasValue.sentToBsdbTStampStr)
+    @staticmethod
+    def fromJSonFile(fileName):
+        '''
+        Generator of the IasValues in a file with one JSON string per line
+        like the files used to replay the values published in the BSDB
         
-        iasValue.readFromBsdbTStampStr = IasValue.getValue(fromJsonDict,"readFromBsdbTStamp")
-        if iasValue.readFromBsdbTStampStr is not None:
-            iasValue.readFromBsdbTStamp=Iso8601TStamp.Iso8601ToDatetime(iasValue.readFromBsdbTStampStr)
+        The file is memory mapped so that the JSON strings are
+        parsed from the bytes of the file without reading it line by line
         
-        iasValue.dasuProductionTStampStr = IasValue.getValue(fromJsonDict,"dasuProductionTStamp")
-        if iasValue.dasuProductionTStampStr is not None:
-            iasValue.dasuProductionTStamp=Iso8601TStamp.Iso8601ToDatetime(iasValue.dasuProductionTStampStr)
-            
-        return iasValue
+        @param fileName the name of the file with the JSON strings
+        @return the generator of the IasValues in the file
+        '''
+        with open(fileName, "rb") as f:
+            if os.fstat(f.fileno()).st_size==0:
+                # Empty files cannot be mapped
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = 0
+                size = len(mm)
+                while start<size:
+                    end = mm.find(b"\n", start)
+                    if end<0:
+                        end = size
+                    line = mm[start:end]
+                    start = end+1
+                    if line.strip():
+                        yield IasValue.fromJSon(line)
         
     def getIdFromFullRunningId(self, frid):
         """
         Extract the id from the fullRunningId
+        
+        The ID of the IASIO is in the last part of the full running ID
+        like (Monitored-System-ID:MONITORED_SOFTWARE_SYSTEM)@...@(AlarmType-ID:IASIO)
         """
-        if frid is None or frid is "":
+        if not frid:
             raise ValueError("The FullRuning ID cannot be empty")
         
-        parts = frid.split("@")
-        iasioIdList = [t for t in parts if t.count("IASIO")]
-        if len(iasioIdList)!=1:
+        match = _FRID_RE.search(frid)
+        if match is None:
             raise ValueError("Invalid format of fullRunningId"+frid)
-        iasioId=iasioIdList[0]
-        if iasioId[0] is not '(' or iasioId[len(iasioId)-1] is not ')' or iasioId.count(':') is not 1:
-            raise ValueError("Invalid format of fullRunningId"+frid)
-        return iasioId[1:-1].split(":")[0]
+        return match.group(1)
     
     @staticmethod
     def getValue(jsonDict,key):
@@ -251,16 +279,25 @@ class IasValue(object):
         @param key: the key
         @return the value of the key if exists, None otherwise
         """
-        try:
-            ret = jsonDict[key]
-        except:
-            ret = None
-        return ret
+        return jsonDict.get(key)
     
     def toJSonString(self):
         """
         @return the JSON representation of the IasValue
         """
+        return _dumps(self._toJSonDict())
+    
+    def toJSonBytes(self):
+        """
+        @return the UTF-8 encoded JSON representation of the IasValue
+                like the values published in kafka
+        """
+        return _dumpsBytes(self._toJSonDict())
+    
+    def _toJSonDict(self):
+        """
+        @return the dictionary to serialize to JSON
+        """
         temp = {
              "value":self.value,
              "valueType":self.valueTypeStr,
@@ -269,26 +306,11 @@ class IasValue(object):
              "iasValidity":self.iasValidityStr
              }
         
-        if self.dependentsFullRuningIds is not None:
-            temp["depsFullRunningIds"]=self.dependentsFullRuningIds
-        if self.props is not None:
-            temp["props"]=self.props
-        if self.pluginProductionTStampStr is not None:
-            temp["pluginProductionTStamp"]=self.pluginProductionTStampStr
-        if self.sentToConverterTStampStr is not None:
-            temp["sentToConverterTStamp"]=self.sentToConverterTStampStr
-        if self.receivedFromPluginTStampStr is not None:
-            temp["receivedFromPluginTStamp"]=self.receivedFromPluginTStampStr
-        if self.convertedProductionTStampStr is not None:
-            temp["convertedProductionTStamp"]=self.convertedProductionTStampStr
-        if self.sentToBsdbTStampStr is not None:
-            temp["sentToBsdbTStamp"]=self.sentToBsdbTStampStr
-        if self.readFromBsdbTStampStr is not None:
-            temp["readFromBsdbTStamp"]=self.readFromBsdbTStampStr
-        if self.dasuProductionTStampStr is not None:
-            temp["dasuProductionTStamp"]=self.dasuProductionTStampStr
-             
-        return json.dumps(temp)
+        for key, attr in IasValue._OPT_KEYS:
+            optValue = getattr(self, attr)
+            if optValue is not None:
+                temp[key] = optValue
+        return temp
     
     def toString(self,verbose=False):
         """
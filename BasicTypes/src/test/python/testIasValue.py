@@ -5,6 +5,8 @@ Created on Jun 8, 2018
 @author: acaproni
 '''
 import unittest
+import os
+import tempfile
 from IASLogging.logConf import Log
 from IasBasicTypes.IasValue import IasValue
 from IasBasicTypes.Iso8601TStamp import Iso8601TStamp
@@ -169,6 +171,54 @@ class TestIasValue(unittest.TestCase):
         self.assertEqual(iasValue2.dasuProductionTStampStr,iasFomJson2.dasuProductionTStampStr)
         self.assertEqual(iasValue2.dasuProductionTStamp,iasFomJson2.dasuProductionTStamp)
         
+    def testFromBytes(self):
+        '''
+        Test the parsing of the UTF-8 encoded JSON string (as read from kafka)
+        '''
+        iasValue = IasValue.fromJSon(self.jSonStr2)
+        iasFromBytes = IasValue.fromJSon(self.jSonStr2.encode("utf-8"))
+        
+        self.assertEqual(iasValue.toJSonString(),iasFromBytes.toJSonString())
+        self.assertEqual(iasValue.toJSonBytes(),iasValue.toJSonString().encode("utf-8"))
+        self.assertEqual(iasValue.id,iasFromBytes.id)
+        self.assertEqual(iasValue.dasuProductionTStamp,iasFromBytes.dasuProductionTStamp)
+        
+    def testSetTimestamp(self):
+        '''
+        Test that a timestamp set as datetime overrides the
+        one converted from the JSON string
+        '''
+        iasValue = IasValue.fromJSon(self.jSonStr)
+        self.assertIsNone(iasValue.readFromBsdbTStamp)
+        
+        tStampStr = "2018-03-07T13:08:43.600"
+        iasValue.readFromBsdbTStamp = Iso8601TStamp.Iso8601ToDatetime(tStampStr)
+        iasValue.readFromBsdbTStampStr = tStampStr
+        self.assertEqual(Iso8601TStamp.datetimeToIsoTimestamp(iasValue.readFromBsdbTStamp),tStampStr)
+        self.assertIn(tStampStr,iasValue.toJSonString())
+        
+    def testFromJSonFile(self):
+        '''
+        Test the reading of IasValues from a file with one JSON string per line
+        '''
+        jsonStrs = [IasValue.fromJSon(self.jSonStr).toJSonString(), IasValue.fromJSon(self.jSonStr2).toJSonString()]
+        
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            # The last line has no new line
+            f.write(jsonStrs[0]+"\n\n"+jsonStrs[1])
+        try:
+            iasValues = list(IasValue.fromJSonFile(f.name))
+        finally:
+            os.unlink(f.name)
+        self.assertEqual([v.toJSonString() for v in iasValues], jsonStrs)
+        
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            pass
+        try:
+            self.assertEqual(list(IasValue.fromJSonFile(f.name)), [])
+        finally:
+            os.unlink(f.name)
+        
 if __name__ == "__main__":
     logger=Log.initLogging(__file__)
     logger.info("Start main")
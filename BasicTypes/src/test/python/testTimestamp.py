@@ -17,6 +17,16 @@ class IsoTimestampTest(unittest.TestCase):
         s = Iso8601TStamp.datetimeToIsoTimestamp(d)
         self.assertEqual(self.tStamp, s)
         
+    def testFractionOfSeconds(self):
+        '''
+        The digits after the seconds are milliseconds
+        whatever their number
+        '''
+        d = Iso8601TStamp.Iso8601ToDatetime("1970-01-01T00:00:00.1")
+        self.assertEqual(d.microsecond, 1000)
+        d = Iso8601TStamp.Iso8601ToDatetime("1970-01-01T00:00:00.100")
+        self.assertEqual(d.microsecond, 100000)
+        
 
 
 if __name__ == "__main__":
@@ -33,7 +33,7 @@ class Property(Base):
 
     @validates('NAME')
     def validate_name(self,key,name):
-        assert(name is not None and name is not '')
+        assert(name is not None and name != '')
         return name
 
     iass = relationship("Ias", secondary=ias_props_association_table,back_populates="props")
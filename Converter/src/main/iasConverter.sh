@@ -1,42 +1,39 @@
 #!/bin/bash
 
-TEMP_PARMS_ARRAY=( "$@" )
+# Java properties (-D...) and the other parameters
+# are collected in arrays to preserve the quoting
+JAVA_PROPS=()
+OTHER_PARAMS=()
 
-JAVA_PROPS=""
-OTHER_PARAMS=""
-
-for index in "${!TEMP_PARMS_ARRAY[@]}"
+for param in "$@"
 do
-    if [[ ${TEMP_PARMS_ARRAY[index]} == -D* ]] ;
+    if [[ $param == -D* ]] ;
     then
-    	JAVA_PROPS="$JAVA_PROPS ${TEMP_PARMS_ARRAY[index]}"
+    	JAVA_PROPS+=( "$param" )
 	else
-		OTHER_PARAMS="$OTHER_PARAMS ${TEMP_PARMS_ARRAY[index]}"
+		OTHER_PARAMS+=( "$param" )
 	fi
 done
 
-if [[ ! -z $JAVA_PROPS ]] ;
+if [[ ${#JAVA_PROPS[@]} -gt 0 ]] ;
 then
-	echo "Found java properties: $JAVA_PROPS"
+	echo "Found java properties: ${JAVA_PROPS[*]}"
 fi
 
-if [[ -z $OTHER_PARAMS ]];
+LOGID_PARAM=()
+if [[ ${#OTHER_PARAMS[@]} -eq 0 ]];
 then
 	echo "Missing converter ID in command line"
 else
-	TEMP=( $OTHER_PARAMS )
-	ID=${TEMP_PARMS_ARRAY[0]}
+	ID=${OTHER_PARAMS[0]}
 	echo "Converter ID=$ID"
-	LOGID_PARAM="-i $ID"
+	LOGID_PARAM=( -i "$ID" )
 fi
 
-TEMP=( $OTHER_PARAMS )
-ID=${TEMP_PARMS_ARRAY[0]}
-echo "Supervisor ID=$ID"
-
-CMD="iasRun -l j $JAVA_PROPS $LOGID_PARAM org.eso.ias.converter.Converter $OTHER_PARAMS"
+CMD=( iasRun -l j "${JAVA_PROPS[@]}" "${LOGID_PARAM[@]}" org.eso.ias.converter.Converter "${OTHER_PARAMS[@]}" )
 
 echo Will run
-echo $CMD
+echo "${CMD[@]}"
 
-$CMD
+# Replace this shell with iasRun instead of forking a new process
+exec "${CMD[@]}"
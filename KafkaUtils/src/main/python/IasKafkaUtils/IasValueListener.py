@@ -0,0 +1,24 @@
+'''
+Created on Jun 12, 2018
+
+@author: acaproni
+'''
+
+class IasValueListener(object):
+    """
+    The class to get IasValue
+    
+    The listener passed to KafkaValueConsumer and KafkaValueConsumerAsync
+    must be a subclass of IasValueListener
+    """
+    
+    def iasValueReceived(self,iasValue):
+        """
+        The callback to notify new IasValues
+        received from the BSDB
+        
+        The implementation must override this method
+        
+        KafkaValueConsumerAsync also accepts a coroutine
+        """
+        raise NotImplementedError("Must override this method to get events")
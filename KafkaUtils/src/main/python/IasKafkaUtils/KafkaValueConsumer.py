@@ -10,29 +10,11 @@ from threading import Thread
 
 from IasBasicTypes.IasValue import IasValue
 from IasBasicTypes.Iso8601TStamp import Iso8601TStamp
-from kafka import KafkaConsumer
-from kafka.structs import TopicPartition
+from IasKafkaUtils.IasValueListener import IasValueListener
+from confluent_kafka import Consumer, KafkaException, TopicPartition, OFFSET_END
 
 logger = logging.getLogger(__file__)
 
-class IasValueListener(object):
-    """
-    The class to get IasValue
-    
-    The listener passed to KafkaValueConsumer
-    must be a subclass of IasValueListener
-    """
-    
-    def iasValueReceived(self,iasValue):
-        """
-        The callback to notify new IasValues
-        received from the BSDB
-        
-        The implementation must override this method
-        """
-        raise NotImplementedError("Must override this method to get events")
-    
-
 class KafkaValueConsumer(Thread):
     '''
     Kafka consumer of IasValues.
@@ -54,6 +36,9 @@ class KafkaValueConsumer(Thread):
     # The topic
     topic = None
     
+    # The max number of messages to get from kafka with one poll
+    maxMessagesPerPoll = 1000
+    
     # Signal the thread to terminate
     terminateThread = False
     
@@ -73,6 +58,11 @@ class KafkaValueConsumer(Thread):
         Constructor
         
         @param listener the listener to send IasValues to
+        @param kafkabrokers the kafka servers to connect to like
+                            host1:9092,host2:9092 (string or list of strings)
+        @param topic the topic to get IasValues from
+        @param clientid the id of the kafka client
+        @param groupid the id of the kafka group of consumers
         '''
         Thread.__init__(self)
         if listener is None:
@@ -86,10 +76,13 @@ class KafkaValueConsumer(Thread):
             raise ValueError("The topic can't be None")
         self.topic=topic
         
-        self.consumer = KafkaConsumer(
-            bootstrap_servers=kafkabrokers,
-            client_id=clientid,
-            enable_auto_commit=True)
+        if not isinstance(kafkabrokers, str):
+            kafkabrokers = ",".join(kafkabrokers)
+        self.consumer = Consumer({
+            'bootstrap.servers': kafkabrokers,
+            'client.id': clientid,
+            'group.id': groupid,
+            'enable.auto.commit': True})
         Thread.setDaemon(self, True)
         logger.info('Kafka consumer %s connected to %s and topic %s',clientid,kafkabrokers,topic)
         
@@ -99,43 +92,66 @@ class KafkaValueConsumer(Thread):
         """
         logger.info('Thread to poll for IasValues started')
         
-        partitionsIds=None
-        n = 1 
         if not self.terminateThread:
-            while partitionsIds is None: 
-                partitionsIds=self.consumer.partitions_for_topic(self.topic)
-                if partitionsIds is None:
-                    if n%10==0:
-                        logger.info("Waiting for topic %s to be created",self.topic)
-                    n = n + 1
-                    time.sleep(0.100)
-            
-            partitionsIds=self.consumer.partitions_for_topic(self.topic)
-            logger.info('%d partitions found on topic %s: %s',len(partitionsIds),self.topic,partitionsIds)
-            partitions=[]
-            for pId in partitionsIds:
-                partitions.append(TopicPartition(self.topic,pId))
-            self.consumer.assign(partitions)
-            
-            self.consumer.seek_to_end()
+            partitionsIds = self._waitForPartitions()
+            if partitionsIds is not None:
+                logger.info('%d partitions found on topic %s',len(partitionsIds),self.topic)
+                logger.debug('Partitions of topic %s: %s',self.topic,partitionsIds)
+                # Get events from the end of all the partitions
+                self.consumer.assign([TopicPartition(self.topic,pId,OFFSET_END) for pId in partitionsIds])
+        
+        # Local references save attribute lookups for each message
+        consume = self.consumer.consume
+        maxMessagesPerPoll = self.maxMessagesPerPoll
+        fromJSon = IasValue.fromJSon
+        toIsoTimestamp = Iso8601TStamp.datetimeToIsoTimestamp
+        utcnow = datetime.utcnow
+        iasValueReceived = self.listener.iasValueReceived
         
         self.isGettingEvents=True
-        while True and not self.terminateThread:
+        while not self.terminateThread:
             try:
-                messages = self.consumer.poll(500)
-            except:
-                KeyboardInterrupt
+                messages = consume(num_messages=maxMessagesPerPoll,timeout=0.5)
+            except KafkaException as e:
+                logger.error('Error polling IasValues from kafka: %s',e)
                 break
-            for listOfConsumerRecords in messages.values():
-                for cr in listOfConsumerRecords:
-                    json = cr.value.decode("utf-8")
-                    iasValue = IasValue.fromJSon(json)
-                    iasValue.readFromBsdbTStamp=datetime.utcnow()
-                    iasValue.readFromBsdbTStampStr=Iso8601TStamp.datetimeToIsoTimestamp(iasValue.readFromBsdbTStamp)
-                    self.listener.iasValueReceived(iasValue)
+            for msg in messages:
+                if msg.error():
+                    logger.warning('Error getting IasValues from kafka: %s',msg.error())
+                    continue
+                # IasValue parses the bytes without decoding them
+                iasValue = fromJSon(msg.value())
+                readTStamp = utcnow()
+                iasValue.readFromBsdbTStamp=readTStamp
+                iasValue.readFromBsdbTStampStr=toIsoTimestamp(readTStamp)
+                iasValueReceived(iasValue)
+        self.consumer.close()
         self.isGettingEvents=False
         logger.info('Thread terminated')
         
+    def _waitForPartitions(self):
+        """
+        Wait until the topic has been created
+
+        @return the IDs of the partitions of the topic or
+                None if the thread has been terminated while waiting
+        """
+        n = 1
+        while not self.terminateThread:
+            try:
+                topicMetadata = self.consumer.list_topics(topic=self.topic,timeout=1).topics.get(self.topic)
+            except KafkaException as e:
+                # The brokers are not reachable
+                logger.debug("Error getting the partitions of topic %s: %s",self.topic,e)
+                topicMetadata = None
+            if topicMetadata is not None and topicMetadata.error is None and topicMetadata.partitions:
+                return list(topicMetadata.partitions.keys())
+            if n%10==0:
+                logger.info("Waiting for topic %s to be created",self.topic)
+            n = n + 1
+            time.sleep(0.100)
+        return None
+        
     def start(self):
         logger.info('Starting thread to poll for IasValues')
         Thread.start(self)
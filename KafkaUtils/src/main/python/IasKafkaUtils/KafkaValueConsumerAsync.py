@@ -0,0 +1,153 @@
+'''
+Created on Oct 15, 2026
+'''
+import asyncio
+import inspect
+import logging
+from datetime import datetime
+
+from IasBasicTypes.IasValue import IasValue
+from IasBasicTypes.Iso8601TStamp import Iso8601TStamp
+from IasKafkaUtils.IasValueListener import IasValueListener
+from aiokafka import AIOKafkaConsumer, TopicPartition
+
+logger = logging.getLogger(__file__)
+
+class KafkaValueConsumerAsync(object):
+    '''
+    asyncio Kafka consumer of IasValues.
+
+    It is the counterpart of KafkaValueConsumer for applications
+    that run in an asyncio event loop: several consumers can run
+    in the same loop without a thread for each of them.
+
+    Each received IasValue is sent to the listener.
+
+    The listener must inherit from IasValueListener; its iasValueReceived
+    can be a coroutine that is awaited before getting the next IasValue
+
+    Like KafkaValueConsumer, KafkaValueConsumerAsync gets all the partitions
+    of the topic from the end and, if the topic does not exist,
+    waits until the producer creates it.
+
+    Usage:
+        consumer = KafkaValueConsumerAsync(listener, brokers, topic, clientid, groupid)
+        await consumer.start()
+        task = asyncio.ensure_future(consumer.run())
+        ...
+        await consumer.close()
+    '''
+
+    # The time (seconds) to wait before checking again if the topic exists
+    waitTopicInterval = 1
+
+    def __init__(self,
+                 listener,
+                 kafkabrokers,
+                 topic,
+                 clientid,
+                 groupid):
+        '''
+        Constructor
+
+        @param listener the listener to send IasValues to
+        @param kafkabrokers the kafka servers to connect to like
+                            host1:9092,host2:9092 (string or list of strings)
+        @param topic the topic to get IasValues from
+        @param clientid the id of the kafka client
+        @param groupid the id of the kafka group of consumers
+        '''
+        if listener is None:
+            raise ValueError("The listener can't be None")
+        if not isinstance(listener,IasValueListener):
+            raise ValueError("The listener msut be a subclass of IasValueListener")
+        self.listener=listener
+
+        if topic is None:
+            raise ValueError("The topic can't be None")
+        self.topic=topic
+
+        self.kafkabrokers=kafkabrokers
+        self.clientid=clientid
+        self.groupid=groupid
+
+        # The aiokafka consumer, built by start() in the event loop
+        self.consumer = None
+
+        # Signal that the consumer has been closed
+        self.closed = False
+
+    def _buildConsumer(self):
+        '''
+        @return a new aiokafka consumer
+        '''
+        return AIOKafkaConsumer(
+            bootstrap_servers=self.kafkabrokers,
+            client_id=self.clientid,
+            group_id=self.groupid,
+            enable_auto_commit=True)
+
+    async def start(self):
+        '''
+        Connect to kafka and assign all the partitions of the topic
+
+        If the topic does not exist, waits until it is created
+
+        @raise KafkaConnectionError: if the kafka brokers are not reachable
+        '''
+        n = 1
+        while not self.closed:
+            self.consumer = self._buildConsumer()
+            await self.consumer.start()
+            # The consumer gets the metadata of the topics when started
+            partitionsIds = self.consumer.partitions_for_topic(self.topic)
+            if partitionsIds:
+                break
+            await self.consumer.stop()
+            if n%10==0:
+                logger.info("Waiting for topic %s to be created",self.topic)
+            n = n + 1
+            await asyncio.sleep(self.waitTopicInterval)
+        else:
+            return
+
+        logger.info('%d partitions found on topic %s',len(partitionsIds),self.topic)
+        logger.debug('Partitions of topic %s: %s',self.topic,partitionsIds)
+        self.consumer.assign([TopicPartition(self.topic,pId) for pId in partitionsIds])
+        await self.consumer.seek_to_end()
+        logger.info('Kafka consumer %s connected to %s and topic %s',self.clientid,self.kafkabrokers,self.topic)
+
+    async def run(self):
+        '''
+        Get IasValues from the BSDB and send them to the listener
+        until the consumer is closed
+        '''
+        if self.closed:
+            return
+        logger.info('Getting IasValues')
+        fromJSon = IasValue.fromJSon
+        toIsoTimestamp = Iso8601TStamp.datetimeToIsoTimestamp
+        utcnow = datetime.utcnow
+        iasValueReceived = self.listener.iasValueReceived
+        try:
+            async for msg in self.consumer:
+                # IasValue parses the bytes without decoding them
+                iasValue = fromJSon(msg.value)
+                readTStamp = utcnow()
+                iasValue.readFromBsdbTStamp=readTStamp
+                iasValue.readFromBsdbTStampStr=toIsoTimestamp(readTStamp)
+                ret = iasValueReceived(iasValue)
+                if inspect.isawaitable(ret):
+                    await ret
+        except asyncio.CancelledError:
+            logger.info('Getting IasValues cancelled')
+            raise
+        logger.info('Stopped getting IasValues')
+
+    async def close(self):
+        '''
+        Close the consumer: run() terminates
+        '''
+        self.closed = True
+        if self.consumer is not None:
+            await self.consumer.stop()
@@ -40,8 +40,7 @@ class KafkaValueProducer(object):
             bootstrap_servers=kafkabrokers, 
             client_id=clientid,
             linger_ms=100,
-            key_serializer=str.encode,
-            value_serializer=str.encode)
+            key_serializer=str.encode)
         if type(topic) == bytes:
             self.topic = topic.decode('utf-8')
         else:
@@ -57,9 +56,10 @@ class KafkaValueProducer(object):
         @param iasValue: the IasValue to publish
         @return the feature to be informed when the value has been sent
         '''
-        iasValueStr = value=iasValue.toJSonString()
+        # The IasValue is serialized directly to bytes, without
+        # building and then encoding the JSON string
         id = iasValue.id
-        return self.producer.send(self.topic,value=iasValueStr,key=id)
+        return self.producer.send(self.topic,value=iasValue.toJSonBytes(),key=id)
         
     def flush(self):
         '''
@@ -0,0 +1,164 @@
+#! /usr/bin/env python
+'''
+
+Test the kafka publisher and the asyncio subscriber
+
+Created on Oct 15, 2026
+'''
+import asyncio
+import unittest
+from IasKafkaUtils.KafkaValueConsumerAsync import KafkaValueConsumerAsync
+from IasKafkaUtils.IasValueListener import IasValueListener
+from IasKafkaUtils.KafkaValueProducer import KafkaValueProducer
+from IasBasicTypes.IasValue import IasValue
+from IASLogging.logConf import Log
+
+class TestAsyncListener(IasValueListener):
+    '''
+    The listener of IasValues read from the kafka topic
+    whose iasValueReceived is a coroutine
+    '''
+
+    def __init__(self, baseId, expected):
+        """
+        Constructor
+
+        @param baseId: the prefix of the IDs of the IasValues to collect
+        @param expected: the number of IasValues to wait for
+        """
+        self.baseId = baseId
+        self.expected = expected
+        self.receivedValues = []
+        self.allReceived = asyncio.Event()
+
+    async def iasValueReceived(self,iasValue):
+        """
+        Collect the IasValue published by the test
+        """
+        await asyncio.sleep(0)
+        if iasValue.id.startswith(self.baseId):
+            self.receivedValues.append(iasValue)
+            if len(self.receivedValues)==self.expected:
+                self.allReceived.set()
+
+
+class TestValueProdConsAsync(unittest.TestCase):
+
+    kafkabrokers='localhost:9092'
+    # The topic does not exist before the test so that the consumer
+    # waits for the producer to create it
+    topic="Test-PyProdConsAsync-Topic"
+
+    # The number of IasValues to publish
+    n = 100
+
+    # The time (seconds) to wait for the consumer and the IasValues
+    timeout = 60
+
+    # JSON string to build IasValues
+    jsonStr = """{"value":"0","pluginProductionTStamp":"1970-01-01T00:00:00.1",
+            "sentToConverterTStamp":"1970-01-01T00:00:00.2", "receivedFromPluginTStamp":"1970-01-01T00:00:00.3",
+            "convertedProductionTStamp":"1970-01-01T00:00:00.4","sentToBsdbTStamp":"1970-01-01T00:00:00.5",
+            "readFromBsdbTStamp":"1970-01-01T00:00:00.6","dasuProductionTStamp":"1970-01-01T00:00:00.7",
+            "depsFullRunningIds":["(SupervId1:SUPERVISOR)@(dasuVID1:DASU)@(asceVID1:ASCE)@(AlarmID1:IASIO)","(SupervId2:SUPERVISOR)@(dasuVID2:DASU)@(asceVID2:ASCE)@(AlarmID2:IASIO)"],
+            "mode":"DEGRADED","iasValidity":"RELIABLE",
+            "fullRunningId":"(Monitored-System-ID:MONITORED_SOFTWARE_SYSTEM)@(plugin-ID:PLUGIN)@(Converter-ID:CONVERTER)@(AlarmType-ID:IASIO)",
+            "valueType":"LONG"}"""
+
+    fullRunningIdPrefix="(Monitored-System-ID:MONITORED_SOFTWARE_SYSTEM)@(plugin-ID:PLUGIN)@(Converter-ID:CONVERTER)@("
+    fullRunningIdSuffix=":IASIO)"
+
+    def buildLONGValue(self,ident, value):
+        '''
+        Builds a IAsValue
+
+        @param ident: the identifier of the IasValue
+        @param value: (LONG) the value
+        '''
+        iasValue = IasValue.fromJSon(self.jsonStr)
+        frid = self.fullRunningIdPrefix+ident+self.fullRunningIdSuffix
+        iasValue.fullRunningId=frid
+        iasValue.id=ident
+        iasValue.value=str(value)
+        return iasValue
+
+    async def prodCons(self):
+        '''
+        Publish IasValues with the producer and get them
+        with the asyncio consumer
+        '''
+        baseId='Test-Async-ID#'
+        listener = TestAsyncListener(baseId, self.n)
+
+        logger.info('Building the consumer')
+        consumer = KafkaValueConsumerAsync(
+            listener,
+            self.kafkabrokers,
+            self.topic,
+            'PyAsyncConsumerTest',
+            'PyAsyncConsumerTestGroup')
+        logger.info('Starting the consumer')
+        startTask = asyncio.ensure_future(consumer.start())
+
+        logger.info('Building the producer')
+        producer = KafkaValueProducer(self.kafkabrokers,self.topic,'PyAsyncProducerTest-ID')
+
+        # The first IasValue creates the topic: start() terminates
+        # when the topic exists and the partitions have been assigned
+        # This IasValue is published before seek_to_end and is not
+        # received by the consumer
+        producer.send(self.buildLONGValue('Test-Async-Topic-Creation',0))
+        producer.flush()
+        await asyncio.wait_for(startTask, self.timeout)
+        logger.info('Consumer started')
+
+        runTask = asyncio.ensure_future(consumer.run())
+
+        # Give the consumer the time to fetch from the end of the partitions
+        await asyncio.sleep(1)
+        logger.info('Publishing %d IasValues',self.n)
+        for i in range(0,self.n):
+            v = self.buildLONGValue(baseId+str(i),i)
+            producer.send(v)
+        producer.flush()
+        logger.info('%d monitor points sent',self.n)
+
+        try:
+            await asyncio.wait_for(listener.allReceived.wait(), self.timeout)
+        except asyncio.TimeoutError:
+            logger.error('Timeout waiting for the IasValues')
+        finally:
+            logger.info('Closing the producer')
+            producer.close()
+            logger.info('Producer closed')
+
+            logger.info('Closing the consumer')
+            runTask.cancel()
+            try:
+                await runTask
+            except asyncio.CancelledError:
+                pass
+            await consumer.close()
+            logger.info('Consumer closed')
+
+        return listener.receivedValues
+
+    def testAsyncProdCons(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            receivedValues = loop.run_until_complete(self.prodCons())
+        finally:
+            loop.close()
+            asyncio.set_event_loop(None)
+
+        self.assertEqual(self.n, len(receivedValues), 'Messages mismatch')
+        # The order is not preserved among the partitions of the topic
+        values = sorted(int(iasValue.value) for iasValue in receivedValues)
+        self.assertEqual(list(range(0,self.n)), values)
+
+
+if __name__ == "__main__":
+    logger=Log.initLogging(__file__)
+    logger.info("Start main")
+    unittest.main()
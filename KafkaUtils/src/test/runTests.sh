@@ -2,3 +2,4 @@
 iasRun -l j org.junit.platform.console.ConsoleLauncher -c org.eso.ias.kafkautils.test.ConsumerProducerTest
 iasRun -l j org.junit.platform.console.ConsoleLauncher -c org.eso.ias.kafkautils.test.KafkaIasiosConsumerTest
 testValueProdCons
+testValueProdConsAsync
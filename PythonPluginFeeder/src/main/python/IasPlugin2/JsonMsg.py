@@ -25,8 +25,11 @@ class JsonMsg(object):
     valueJsonParamName = "value"
     valueTypeJsonParamName = "valueType"
     operationaModeParamName = "operMode"
+    
+    # The format of the ISO 8601 timestamp without milliseconds
+    isoFormat = "%Y-%m-%dT%H:%M:%S"
         
-    def __init__(self, mpointId, value, valueType, timestamp=datetime.utcnow(), operationalMode=None):
+    def __init__(self, mpointId, value, valueType, timestamp=None, operationalMode=None):
         '''
         Constructor
         
@@ -46,7 +49,7 @@ class JsonMsg(object):
         self.mPointID=str(mpointId) 
         
         if timestamp is None:
-            raise ValueError("The timestamp can't be None")
+            timestamp = datetime.utcnow()
         
         if not isinstance(timestamp, datetime):
             # Is it a ISO 8601 string?
@@ -69,6 +72,10 @@ class JsonMsg(object):
         if not operationalMode:
             raise ValueError("Invalid operational mode "+operationalMode)
         self.operationalMode = operationalMode
+        
+        # The message is immutable so the encoded JSON string
+        # to send to the java plugin is built only once
+        self._jsonBytes = self.dumps().encode("utf-8")
     
     
     def checkStringIsoTimestamp(self,tStamp):
@@ -95,15 +102,7 @@ class JsonMsg(object):
         
         @param the datetime to transfor as ISO 8601
         '''
-        
-        # isoTStamp in microseconds like 2018-05-09T16:15:05.775444
-        isoTStamp=tStamp.isoformat() 
-        
-        # split the timestamop in 2 parts like
-        # ['2018-05-09T16:15:05', '775444']
-        splittedTStamp = isoTStamp.split('.')
-        milliseconds = splittedTStamp[1][:3]
-        return splittedTStamp[0]+"."+milliseconds
+        return "%s.%03d" % (tStamp.strftime(JsonMsg.isoFormat), tStamp.microsecond//1000)
         
     def dumps(self):
         '''
@@ -120,6 +119,12 @@ class JsonMsg(object):
             JsonMsg.valueTypeJsonParamName: vType,
             JsonMsg.operationaModeParamName: mode})
     
+    def dumpsBytes(self):
+        '''
+        Return the UTF-8 encoded JSON string to send to the java plugin
+        '''
+        return self._jsonBytes
+    
     
     @staticmethod
     def parse(jsonStr):
@@ -5,7 +5,6 @@ Created on May 9, 2018
 '''
 
 import socket, os
-from datetime import datetime
 from IasPlugin2.JsonMsg import JsonMsg
 import logging
 from threading import Timer, RLock
@@ -43,7 +42,7 @@ class UdpPlugin(object):
     SENDING_TIME_INTERVAL = 0.250
     
     # The operational mode
-    mode = [ 'STARTUP',
+    mode = frozenset([ 'STARTUP',
             'INITIALIZATION',
             'CLOSING',
             'SHUTTEDDOWN', 
@@ -51,17 +50,17 @@ class UdpPlugin(object):
             'MALFUNCTIONING',
             'OPERATIONAL',
             'DEGRADED',
-            'UNKNOWN']
+            'UNKNOWN'])
     
     # The states of alarms
-    alarm = [ 'SET_CRITICAL',
+    alarm = frozenset([ 'SET_CRITICAL',
             'SET_HIGH',
             'SET_MEDIUM',
             'SET_LOW',
-            'CLEARED']
+            'CLEARED'])
     
     # The types of the monitor points
-    valueType = ['LONG',
+    valueType = frozenset(['LONG',
                  'INT',
                  'SHORT',
                  'BYTE',
@@ -70,7 +69,7 @@ class UdpPlugin(object):
                  'BOOLEAN',
                  'CHAR',
                  'STRING',
-                 'ALARM']
+                 'ALARM'])
     
     def __init__(self, hostname, port):
         '''
@@ -150,7 +149,7 @@ class UdpPlugin(object):
         else:
             return None
         
-    def submit(self, mPointID, value, valueType, timestamp=datetime.utcnow(), operationalMode='OPERATIONAL'):
+    def submit(self, mPointID, value, valueType, timestamp=None, operationalMode='OPERATIONAL'):
         '''
         Submit a monitor point or alarm with the give ID to the java plugin.
         
@@ -161,23 +160,22 @@ class UdpPlugin(object):
         @param valueType: the type of the monitor point (must be in self.valueType)
         @param timestamp: (datetime) the timestamp when the value has been
                           read from the monitored system
+                          (if not provided, it is set to the actual time)
         @param operationalMode the optional operational mode must be in (self.mode)
         @see: JsonMsg.IAS_SUPPORTED_TYPES
         '''
         if not mPointID:
             raise ValueError("The ID can't be None neither empty")
-        if timestamp is None:
-            raise ValueError("The timestamp can't be None")
         if value is None:
             raise ValueError("The value can't be None")
         if not valueType:
             raise ValueError("The type can't be None")
-        if self.valueType.count(valueType)==0:
-            raise ValueError("Unrecognized type "+type)
+        if valueType not in self.valueType:
+            raise ValueError("Unrecognized type "+valueType)
         
         if not operationalMode:
             raise ValueError("The operational mode can't be None")
-        if self.mode.count(operationalMode)==0:
+        if operationalMode not in self.mode:
             raise ValueError("Unrecognized operational mode "+operationalMode)
         
         if self._shuttedDown:
@@ -186,12 +184,15 @@ class UdpPlugin(object):
         self._lock.acquire()
         self._MPointsToSend[msg.mPointID]=msg
         self._lock.release()
-        logging.debug("Monitor point %s of type %s submitted with value %s and mode %s (%d values in queue)",
-                          msg.mPointID,
-                          msg.valueType,
-                          msg.value,
-                          msg.operationalMode,
-                          len(self._MPointsToSend))
+        # Explicitly checked to save building the arguments
+        # of each submitted monitor point when debug is disabled
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug("Monitor point %s of type %s submitted with value %s and mode %s (%d values in queue)",
+                              msg.mPointID,
+                              msg.valueType,
+                              msg.value,
+                              msg.operationalMode,
+                              len(self._MPointsToSend))
         
     def _sendMonitorPoints(self):
         '''
@@ -222,9 +223,6 @@ class UdpPlugin(object):
         
         @param mPoint: the monitor point (JsonMsg) to send to the java plugin 
         '''
-        # Get the JSON representation of the object to send
-        jsonStr = mPoint.dumps()
-        
-        # send the string to the UDP socket
-        self._sock.sendto(jsonStr.encode("utf-8"),(self._ip, self._port))
+        # send the JSON representation of the object to the UDP socket
+        self._sock.sendto(mPoint.dumpsBytes(),(self._ip, self._port))
         
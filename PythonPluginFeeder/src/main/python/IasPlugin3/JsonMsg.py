@@ -4,7 +4,12 @@ Created on May 9, 2018
 @author: acaproni
 '''
 
-import json
+try:
+    # orjson is faster than json, if available
+    import orjson as _json
+except ImportError:
+    import json as _json
+from json.encoder import encode_basestring_ascii
 from datetime import datetime
 import dateutil.parser
 from IasBasicTypes.OperationalMode import OperationalMode
@@ -21,14 +26,33 @@ class JsonMsg(object):
     org.eso.ias.types.IASTypes
     '''
     
+    # JsonMsg objects are queued until sent to the java plugin:
+    # slots reduce the memory used by each message
+    __slots__ = ('mPointID', 'timestamp', 'value', 'valueType', 'operationalMode', '_json', '_jsonBytes')
+    
     # define the names of the json fields
     idJsonParamName = "monitorPointId"
     tStampJsonParamName = "timestamp"
     valueJsonParamName = "value"
     valueTypeJsonParamName = "valueType"
     operationaModeParamName = "operMode"
-        
-    def __init__(self, mpointId, value, valueType, timestamp=datetime.utcnow(), operationalMode=None):
+    
+    # The format of the ISO 8601 timestamp without milliseconds
+    isoFormat = "%Y-%m-%dT%H:%M:%S"
+    
+    # The template of the JSON string to send to the java plugin
+    #
+    # The ID, the timestamp and the value are passed by the caller and
+    # are escaped before being formatted; the other fields are generated
+    # by the IAS and do not need escaping
+    jsonTemplate = '{"%s":%%s,"%s":%%s,"%s":%%s,"%s":"%%s","%s":"%%s"}' % (
+        idJsonParamName,
+        tStampJsonParamName,
+        valueJsonParamName,
+        valueTypeJsonParamName,
+        operationaModeParamName)
+        
+    def __init__(self, mpointId, value, valueType, timestamp=None, operationalMode=None):
         '''
         Constructor
         
@@ -49,7 +73,7 @@ class JsonMsg(object):
         self.mPointID=str(mpointId) 
         
         if timestamp is None:
-            raise ValueError("The timestamp can't be None")
+            timestamp = datetime.utcnow()
         
         if not isinstance(timestamp, datetime):
             # Is it a ISO 8601 string?
@@ -66,12 +90,17 @@ class JsonMsg(object):
         self.value=value
        
         if not isinstance(valueType, IASType):
-            raise ValueError("Invalid type: "+valueType)
+            raise ValueError("Invalid type: "+str(valueType))
         self.valueType=valueType
         
         if not operationalMode is None and not isinstance(operationalMode,OperationalMode):
-            raise ValueError("Invalid operational mode "+operationalMode)
+            raise ValueError("Invalid operational mode "+str(operationalMode))
         self.operationalMode = operationalMode
+        
+        # The message is immutable so the JSON string (and its encoding)
+        # is built only once
+        self._json = self._buildJsonStr()
+        self._jsonBytes = self._json.encode("utf-8")
     
     
     def checkStringIsoTimestamp(self,tStamp):
@@ -98,39 +127,42 @@ class JsonMsg(object):
         
         @param the datetime to transfor as ISO 8601
         '''
+        return "%s.%03d" % (tStamp.strftime(JsonMsg.isoFormat), tStamp.microsecond//1000)
         
-        # isoTStamp in microseconds like 2018-05-09T16:15:05.775444
-        isoTStamp=tStamp.isoformat() 
-        
-        # split the timestamop in 2 parts like
-        # ['2018-05-09T16:15:05', '775444']
-        splittedTStamp = isoTStamp.split('.')
-        milliseconds = splittedTStamp[1][:3]
-        return splittedTStamp[0]+"."+milliseconds
-        
-    def dumps(self):
+    def _buildJsonStr(self):
         '''
-        Return the JSON string to send to the java plugin 
+        Build the JSON string to send to the java plugin
         '''
-        
-        vType = str(self.valueType).split('.')[1]
+        vType = self.valueType.name
         
         if self.operationalMode is None:
             mode = ""
         else:
-            mode = str(self.operationalMode).split('.')[1]
+            mode = self.operationalMode.name
         
         if self.valueType==IASType.ALARM:
-            value = str(self.value).split(".")[1]
+            value = self.value.name
         else:
             value = str(self.value)
         
-        return json.dumps({
-            JsonMsg.idJsonParamName:self.mPointID, 
-            JsonMsg.tStampJsonParamName:self.timestamp, 
-            JsonMsg.valueJsonParamName: value, 
-            JsonMsg.valueTypeJsonParamName: vType,
-            JsonMsg.operationaModeParamName: mode})
+        return JsonMsg.jsonTemplate % (
+            encode_basestring_ascii(self.mPointID),
+            encode_basestring_ascii(self.timestamp),
+            encode_basestring_ascii(value),
+            vType,
+            mode)
+        
+    def dumps(self):
+        '''
+        Return the JSON string to send to the java plugin 
+        '''
+        return self._json
+    
+    def dumpsBytes(self):
+        '''
+        Return the UTF-8 encoded JSON string to send to the java plugin
+        '''
+        return self._jsonBytes
     
     
     @staticmethod
@@ -138,9 +170,9 @@ class JsonMsg(object):
         '''
         Parse the passed string and return a JsonMsg
         
-        @param jsonStr the json string representing a message to send to the java plugin
+        @param jsonStr the json string (or bytes) representing a message to send to the java plugin
         '''
-        obj = json.loads(jsonStr)
+        obj = _json.loads(jsonStr)
         
         mPointType = IASType.fromString(obj[JsonMsg.valueTypeJsonParamName])
         
@@ -4,12 +4,178 @@ Created on May 9, 2018
 @author: acaproni
 '''
 
-import socket, os
-from datetime import datetime
+import socket, os, time
 from IasPlugin3.JsonMsg import JsonMsg
 import logging
-from threading import Timer, RLock
+from threading import Thread, Event, Lock
 
+# The IP addresses of the host names already resolved
+# (key=host name, value=(IP, time of the resolution))
+_DNS_CACHE = {}
+
+# The time (seconds) an IP address is kept in _DNS_CACHE
+_DNS_CACHE_TTL = 60
+
+def _resolveHostname(hostname):
+    '''
+    Get the IP address of the passed host name
+    
+    The address is taken from the cache, if it has been resolved
+    recently, otherwise it is resolved and cached
+    
+    @param hostname: the host name to resolve
+    @return: the IP address of the host
+    @raise exception: if the hostname is not resolved
+    '''
+    now = time.monotonic()
+    cached = _DNS_CACHE.get(hostname)
+    if cached is not None and now-cached[1]<_DNS_CACHE_TTL:
+        return cached[0]
+    ip = socket.gethostbyname(hostname)
+    _DNS_CACHE[hostname] = (ip, now)
+    return ip
+
+class _UdpSender(object):
+    '''
+    _UdpSender periodically sends the monitor points of all the
+    started UdpPlugin objects that send to the same java plugin 
+    (IP and port), by means of one UDP socket and one thread.
+    
+    _UdpSender objects are shared and reference counted: UdpPlugin gets
+    a sender with acquire() and gives it back with release().
+    The socket is closed and the thread terminated when the
+    sender is released by the last UdpPlugin.
+    '''
+    
+    # The senders in use (key=(IP, port), value=_UdpSender)
+    _senders = {}
+    
+    # The lock to protect _senders
+    _sendersLock = Lock()
+    
+    def __init__(self, ip, port):
+        '''
+        Constructor
+        
+        @param ip the IP address to send data packets to
+        @param port the port to send UDP packets to
+        '''
+        self._ip = ip
+        self._port = port
+        
+        # The UDP socket to send messages to the java plugin
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        
+        # Connecting the UDP socket sets the default destination of 
+        # all the packets so the kernel does not need to get the
+        # address at every send
+        self._sock.connect((self._ip, self._port))
+        
+        # The started UdpPlugin objects whose monitor points
+        # are sent by this object
+        self._plugins = []
+        
+        # The lock to protect _plugins
+        self._lock = Lock()
+        
+        # The event to terminate the thread
+        self._shutdownEvent = Event()
+        
+        self._thread = Thread(
+            target=self._run, 
+            name='UdpPlugin sender thread %s:%d' % (self._ip,self._port), 
+            daemon=True)
+        self._thread.start()
+        
+    @staticmethod
+    def acquire(ip, port, plugin):
+        '''
+        Get the sender for the passed IP and port, building it
+        if it does not exist, and add the plugin to the plugins
+        whose monitor points are sent by the sender
+        
+        @param ip the IP address to send data packets to
+        @param port the port to send UDP packets to
+        @param plugin the UdpPlugin whose monitor points are sent by the sender
+        @return: the _UdpSender
+        '''
+        with _UdpSender._sendersLock:
+            sender = _UdpSender._senders.get((ip, port))
+            if sender is None:
+                sender = _UdpSender(ip, port)
+                _UdpSender._senders[(ip, port)] = sender
+            with sender._lock:
+                sender._plugins.append(plugin)
+        return sender
+    
+    def release(self, plugin):
+        '''
+        Stop sending the monitor points of the passed plugin and
+        close the sender if no other plugin uses it
+        
+        @param plugin the UdpPlugin to remove from the sender
+        '''
+        with _UdpSender._sendersLock:
+            with self._lock:
+                self._plugins.remove(plugin)
+                unused = not self._plugins
+            if unused:
+                del _UdpSender._senders[(self._ip, self._port)]
+        if unused:
+            self._shutdownEvent.set()
+            self._thread.join()
+            self._sock.close()
+        
+    def _run(self):
+        '''
+        The thread that sends the monitor points to the java plugin
+        every UdpPlugin.SENDING_TIME_INTERVAL seconds until the sender is closed
+        
+        The time of the next sending is calculated from the time of
+        the previous one so that the time spent sending monitor points
+        does not delay the following sendings
+        '''
+        nextTime = time.monotonic()
+        while not self._shutdownEvent.is_set():
+            nextTime += UdpPlugin.SENDING_TIME_INTERVAL
+            delay = nextTime-time.monotonic()
+            if delay>0:
+                if self._shutdownEvent.wait(delay):
+                    break
+            else:
+                # Late: do not try to recover the lost intervals
+                nextTime = time.monotonic()
+            self._sendMonitorPoints()
+        
+    def _sendMonitorPoints(self):
+        '''
+        Send the monitor points submitted in the last time interval 
+        to the java plugin through the UDP socket
+        '''
+        with self._lock:
+            plugins = list(self._plugins)
+        packets = []
+        for plugin in plugins:
+            packets.extend(mPoint.dumpsBytes() for mPoint in plugin._getMonitorPointsToSend())
+        if not packets:
+            return
+        debugEnabled = logging.root.isEnabledFor(logging.DEBUG)
+        if debugEnabled:
+            logging.debug("Sending %d monitor points",len(packets))
+        #
+        # Send the monitor points with the UDP socket
+        #
+        try:
+            for packet in packets:
+                self._sock.send(packet)
+            if debugEnabled:
+                logging.debug('Monitor points sent')
+        except OSError as e:
+            # The socket is connected so errors like a java plugin 
+            # not listening are reported at the next send:
+            # monitor points are lost as it happens with any UDP packet
+            logging.warning('Error sending monitor points: %s',e)
+        
 class UdpPlugin(object):
     '''
     UpdPlugin sends monitor points to the java plugin by means 
@@ -37,11 +203,19 @@ class UdpPlugin(object):
     In this way if the same value is sent many times in the time interval 
     only the last value is effectively sent to the java plugin mitigating
     a misbehaving implementation. 
+    
+    All the UdpPlugin objects sending monitor points to the same 
+    java plugin share the same UDP socket and sending thread.
     '''
     
     # Monitor points are periodically sent in seconds
     SENDING_TIME_INTERVAL = 0.250
     
+    # The max number of monitor points waiting to be sent:
+    # when the limit is reached the monitor point submitted
+    # less recently is discarded
+    MAX_QUEUED_MPOINTS = 10000
+    
     def __init__(self, hostname, port):
         '''
         Constructor.
@@ -53,7 +227,7 @@ class UdpPlugin(object):
         
         self._hostname = hostname
         self._port=port
-        self._ip = socket.gethostbyname(self._hostname)
+        self._ip = _resolveHostname(self._hostname)
         
         logging.info('UdpPlugin will send UDP messages to %s(%s):%d',self._hostname,self._ip,self._port )
         
@@ -61,23 +235,24 @@ class UdpPlugin(object):
         # (key=MPoint ID, value = JSonMsg)
         self._MPointsToSend = {}
         
-        # The UDP socket to send messages to the java plugin
-        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # The number of monitor points discarded because
+        # _MPointsToSend was full
+        self._numOfDiscarded = 0
         
-        # A flag to terminate the thread when the
-        # object is shut down
-        self._shuttedDown = False
+        # The event set when the object is shut down
+        self._shutdownEvent = Event()
         
         # A flag reporting if the object has been initialized
         self._started = False
         
-        # The time r to send monitor points to the 
-        # java plugin
-        self._timer = None
+        # The sender (shared with the other UdpPlugin objects 
+        # sending to the same java plugin) that periodically 
+        # sends the monitor points
+        self._sender = None
         
         # The lock for protecting shared data 
         # between threads
-        self._lock = RLock()
+        self._lock = Lock()
         
         logging.info("UdpPlugin built")
     
@@ -88,39 +263,21 @@ class UdpPlugin(object):
         assert  not self._started
         logging.info('Starting up')
         self._started = True
-        self._timer = self._schedule()
+        self._sender = _UdpSender.acquire(self._ip, self._port, self)
         logging.info('Started.')
     
     def shutdown(self):
         '''
         Shutdown the plugin
         '''
-        assert  not self._shuttedDown
+        assert  not self._shutdownEvent.is_set()
         logging.info('Shutting down')
-        self._lock.acquire(blocking=True)
-        self._shuttedDown = True
-        self._lock.release()
-        if self._started and self._timer is not None:
-            self._timer.cancel()
-        self._sock.close()
+        self._shutdownEvent.set()
+        if self._started:
+            self._sender.release(self)
         logging.info('Closed.')
         
-    def _schedule(self):
-        '''
-        Schedule the timer for the next sending
-        
-        @return: the scheduled timer or None if shut down
-        '''
-        if not self._shuttedDown:
-                self._lock.acquire()
-                timer = Timer(UdpPlugin.SENDING_TIME_INTERVAL, self._sendMonitorPoints)
-                timer.start()
-                self._lock.release()
-                return timer
-        else:
-            return None
-        
-    def submit(self, mPointID, value, valueType, timestamp=datetime.utcnow(), operationalMode=None):
+    def submit(self, mPointID, value, valueType, timestamp=None, operationalMode=None):
         '''
         Submit a monitor point or alarm with the give ID to the java plugin.
         
@@ -131,63 +288,44 @@ class UdpPlugin(object):
         @param valueType: (IasTye)the IasType of the monitor point
         @param timestamp: (datetime) the timestamp when the value has been
                           red from the monitored system
+                          (if not provided, it is set to the actual time)
         @param operationalMode (OperationalMode) the optional operational mode
-        @see: JsonMsg.IAS_SUPPORTED_TYPES
-        '''
-        if not mPointID:
-            raise ValueError("The ID can't be None neither empty")
-        if timestamp is None:
-            raise ValueError("The timestamp can't be None")
-        if value is None:
-            raise ValueError("The value can't be None")
-        if valueType is None:
-            raise ValueError("The type can't be None")
-        
-        if self._shuttedDown:
-            return
+        @raise ValueError: if the parameters are not valid
+        '''
+        # JsonMsg validates the parameters
         msg = JsonMsg(mPointID,value, valueType,timestamp,operationalMode)
-        self._lock.acquire()
-        self._MPointsToSend[msg.mPointID]=msg
-        self._lock.release()
-        logging.debug("Monitor point %s of type %s submitted with value %s and mode %s (%d values in queue)",
-                          msg.mPointID,
-                          msg.valueType,
-                          msg.value,
-                          msg.operationalMode,
-                          len(self._MPointsToSend))
+        if self._shutdownEvent.is_set():
+            return
+        with self._lock:
+            # Removed before inserting so that the order of the dictionary
+            # (insertion order) is the order of the last submission
+            self._MPointsToSend.pop(msg.mPointID, None)
+            self._MPointsToSend[msg.mPointID]=msg
+            if len(self._MPointsToSend)>UdpPlugin.MAX_QUEUED_MPOINTS:
+                # Discard the monitor point not updated for the longest time
+                del self._MPointsToSend[next(iter(self._MPointsToSend))]
+                self._numOfDiscarded += 1
+        # Explicitly checked to save building the arguments
+        # of each submitted monitor point when debug is disabled
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug("Monitor point %s of type %s submitted with value %s and mode %s (%d values in queue)",
+                              msg.mPointID,
+                              msg.valueType,
+                              msg.value,
+                              msg.operationalMode,
+                              len(self._MPointsToSend))
         
-    def _sendMonitorPoints(self):
+    def _getMonitorPointsToSend(self):
+        '''
+        Get and remove the monitor points submitted in the last time interval
+        
+        @return: the monitor points (JsonMsg) to send to the java plugin
         '''
-        The periodic task that send monitor points to the java plugin
-        through the UDP socket
-        '''
-        if not self._shuttedDown:
-            logging.debug("Sending %d monitor points",len(self._MPointsToSend))
-            self._lock.acquire()
-            valuesToSend = list(self._MPointsToSend.values())
-            self._MPointsToSend.clear()
-            self._lock.release()
-            #
-            # Send the monitor points with the UDP socket
-            #
-            for mPoint in valuesToSend:
-                self._send(mPoint)
-            logging.debug('Monitor points sent')
-            valuesToSend.clear()
-            
-            ## reschedule the time if not closed
-            self._timer = self._schedule()
-            
-    
-    def _send(self, mPoint):
-        ''' 
-        Send the passed monitor points to the java plugin through the UDP socket
-        
-        @param mPoint: the monitor point (JsonMsg) to send to the java plugin 
-        '''
-        # Get the JSON representation of the object to send
-        jsonStr = mPoint.dumps()
-        
-        # send the string to the UDP socket
-        self._sock.sendto(bytes(jsonStr, "utf-8"),(self._ip, self._port))
-        
\ No newline at end of file
+        # Swap the dictionary so that the lock is held
+        # for the shortest possible time
+        with self._lock:
+            valuesToSend, self._MPointsToSend = self._MPointsToSend, {}
+            numOfDiscarded, self._numOfDiscarded = self._numOfDiscarded, 0
+        if numOfDiscarded>0:
+            logging.warning('%d monitor points discarded: too many monitor points waiting to be sent',numOfDiscarded)
+        return valuesToSend.values()
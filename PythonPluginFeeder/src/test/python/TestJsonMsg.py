@@ -63,6 +63,46 @@ class TestJsonMessage(unittest.TestCase):
         self.assertEqual(fromJString.valueType,IASType.STRING)
         self.assertEqual(fromJString.operationalMode, OperationalMode.OPERATIONAL)
         
+    def testTimestamp(self):
+        '''
+        Test the formatting of the timestamp and its default value
+        '''
+        tStamp = datetime.datetime(2018,5,9,16,15,5,775444)
+        msg = JsonMsg("MPoint-ID", 1, IASType.INT,tStamp)
+        self.assertEqual(msg.timestamp, "2018-05-09T16:15:05.775")
+        
+        tStamp = datetime.datetime(2018,5,9,16,15,5)
+        msg = JsonMsg("MPoint-ID", 1, IASType.INT,tStamp)
+        self.assertEqual(msg.timestamp, "2018-05-09T16:15:05.000")
+        
+        # The default timestamp is the actual time
+        before = datetime.datetime.utcnow().replace(microsecond=0)
+        msg = JsonMsg("MPoint-ID", 1, IASType.INT)
+        after = datetime.datetime.utcnow()
+        tStamp = datetime.datetime.strptime(msg.timestamp,"%Y-%m-%dT%H:%M:%S.%f")
+        self.assertTrue(before<=tStamp<=after)
+        
+    def testStringEscaping(self):
+        '''
+        Test that special chars in the ID, in the timestamp and in the value 
+        are properly escaped in the JSON string
+        '''
+        strValue = 'A "quoted" string with \\ and \t and \u00e8'
+        msg = JsonMsg('MPoint-"ID"', strValue, IASType.STRING,operationalMode=OperationalMode.OPERATIONAL)
+        jStr = msg.dumps()
+        print(jStr)
+        fromJString = JsonMsg.parse(jStr)
+        self.assertEqual(fromJString.mPointID, 'MPoint-"ID"')
+        self.assertEqual(fromJString.value, strValue)
+        self.assertEqual(msg.dumpsBytes(), jStr.encode("utf-8"))
+        
+        tStamp = '2018-05-09T16:15:05.775\t'
+        msg = JsonMsg('id', 1, IASType.INT, tStamp)
+        jStr = msg.dumps()
+        print(jStr)
+        fromJString = JsonMsg.parse(jStr)
+        self.assertEqual(fromJString.timestamp, tStamp)
+        
     def testTypeConversionsBool(self):
         '''
         Test the conversion of all possible IAS data types
@@ -101,6 +141,17 @@ class TestJsonMessage(unittest.TestCase):
         self.assertEqual(fromJString.value, Alarm.SET_MEDIUM)
         self.assertEqual(fromJString.valueType,IASType.ALARM)
         self.assertEqual(fromJString.operationalMode, OperationalMode.SHUTTEDDOWN)
+        
+    def testParseBytes(self):
+        '''
+        Test the parsing of the UTF-8 encoded JSON string
+        '''
+        msg = JsonMsg("MPoint-IDBytes", 10.5, IASType.DOUBLE,operationalMode=OperationalMode.DEGRADED)
+        fromJBytes = JsonMsg.parse(msg.dumpsBytes())
+        self.assertEqual(fromJBytes.mPointID, "MPoint-IDBytes")
+        self.assertEqual(fromJBytes.value, 10.5)
+        self.assertEqual(fromJBytes.timestamp, msg.timestamp)
+        self.assertEqual(fromJBytes.operationalMode, OperationalMode.DEGRADED)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -72,6 +72,50 @@ class TestUdpPlugin(unittest.TestCase):
         time.sleep(2*UdpPlugin.SENDING_TIME_INTERVAL)
         self.assertEqual(len(self.receiver.msgReceived),0)
         
+    def testPluginsShareTheSender(self):
+        '''
+        Test that the plugins sending to the same java plugin
+        share the same sender
+        '''
+        plugin2 = UdpPlugin(TestUdpPlugin.HOST, TestUdpPlugin.PORT)
+        self.plugin.start()
+        plugin2.start()
+        self.assertIs(self.plugin._sender,plugin2._sender)
+        self.plugin.submit("MPoint-ID", 1, IASType.INT)
+        plugin2.submit("MPoint-ID", 2, IASType.INT)
+        time.sleep(2*UdpPlugin.SENDING_TIME_INTERVAL)
+        plugin2.shutdown()
+        self.assertEqual(len(self.receiver.msgReceived),2)
+        values = sorted(JsonMsg.parse(jmsg).value for jmsg in self.receiver.msgReceived)
+        self.assertEqual(values,[1,2])
+        
+    def testMaxQueuedMPoints(self):
+        '''
+        Test that the monitor points submitted less recently are 
+        discarded when too many monitor points are waiting to be sent
+        '''
+        numOfMPoints = UdpPlugin.MAX_QUEUED_MPOINTS+10
+        for i in range(UdpPlugin.MAX_QUEUED_MPOINTS):
+            self.plugin.submit("MPoint-ID"+str(i), i, IASType.INT)
+        # Submitting again the first monitor point saves it from being discarded
+        self.plugin.submit("MPoint-ID0", -1, IASType.INT)
+        for i in range(UdpPlugin.MAX_QUEUED_MPOINTS, numOfMPoints):
+            self.plugin.submit("MPoint-ID"+str(i), i, IASType.INT)
+        self.assertEqual(len(self.plugin._MPointsToSend),UdpPlugin.MAX_QUEUED_MPOINTS)
+        self.assertIn("MPoint-ID0",self.plugin._MPointsToSend)
+        self.assertEqual(self.plugin._MPointsToSend["MPoint-ID0"].value, -1)
+        self.assertNotIn("MPoint-ID10",self.plugin._MPointsToSend)
+        self.assertIn("MPoint-ID11",self.plugin._MPointsToSend)
+        self.assertIn("MPoint-ID"+str(numOfMPoints-1),self.plugin._MPointsToSend)
+        
+    def testSubmitInvalidParams(self):
+        '''
+        Test that submit rejects invalid parameters
+        '''
+        self.assertRaises(ValueError, self.plugin.submit, "", 123, IASType.INT)
+        self.assertRaises(ValueError, self.plugin.submit, "MPoint-ID", None, IASType.INT)
+        self.assertRaises(ValueError, self.plugin.submit, "MPoint-ID", 123, None)
+        
     def testSendIfStarted(self):
         '''
         Test that the plugin send a monitor point to the UDP after 
@@ -116,6 +160,20 @@ class TestUdpPlugin(unittest.TestCase):
         self.assertEqual(m.valueType,IASType.ALARM)
         self.assertEqual(m.operationalMode,OperationalMode.DEGRADED)
         
+    def testSendManyMonitorPoints(self):
+        '''
+        Test that all the monitor points submitted in the same
+        time interval are sent to the UDP socket
+        '''
+        self.plugin.start()
+        numOfMPoints = 100
+        for i in range(numOfMPoints):
+            self.plugin.submit("MPoint-ID"+str(i), i, IASType.INT)
+        time.sleep(2*UdpPlugin.SENDING_TIME_INTERVAL)
+        self.assertEqual(len(self.receiver.msgReceived),numOfMPoints)
+        ids = set(JsonMsg.parse(jmsg).mPointID for jmsg in self.receiver.msgReceived)
+        self.assertEqual(len(ids),numOfMPoints)
+        
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,9 +8,9 @@ Created on Jul 7, 2017
 
 import sys
 import os
-import shutil
-from subprocess import call
-from glob import glob
+import pkgutil
+import pydoc
+from contextlib import redirect_stdout
 from IASApiDocs.DocGenerator import DocGenerator
 import logging 
 
@@ -39,13 +39,8 @@ class PydocBuilder(DocGenerator):
         Note that these files are python scripts that do not belong
         to a python module
         """
-        ret = []
-        files= os.listdir(folder)
-        for f in files:
-            if f.endswith(".py"):
-                ret.append(f)
-        
-        return ret 
+        with os.scandir(folder) as entries:
+            return [e.name for e in entries if e.name.endswith(".py") and e.is_file()]
         
     def buildIndex(self,folder):
         """
@@ -57,90 +52,110 @@ class PydocBuilder(DocGenerator):
         """
         logging.info("Generating index in %s",folder)
         
-        htmlFilePaths = glob(folder+"/*.html")
-        htmlFiles = []
-        for f in htmlFilePaths:
-            parts = f.split("/")
-            fileName = parts[len(parts)-1]
-            htmlFiles.append(fileName)
-        htmlFiles.sort()
+        with os.scandir(folder) as entries:
+            htmlFiles = sorted(e.name for e in entries if e.name.endswith(".html") and e.is_file())
+        
+        # The names of the files with and without the .html extension
+        names = [(f, os.path.splitext(f)[0]) for f in htmlFiles]
         
         # Look for python modules that can be taken from
         # file names having 2 dots like IASApiDocs.DocGenerator.html
-        pyModules = []
-        for f in htmlFiles:
-            parts = f.split(".")
-            if (len(parts)>2):
-                if (parts[0] not in pyModules):
-                    pyModules.append(parts[0])
-        pyModules.sort()
-        logging.info("Python modules %s",pyModules)
-        
-        msg = "<!DOCTYPE html><html>\n<body>\n"
-        msg += "\t<h1>IAS python API</h1>\n"
-        msg += "\t<h2>Scripts</h2>\n"
-        msg += "\t<UL>\n"
-        
-        for f in htmlFiles:
-            parts = f.split(".")
-            if (len(parts)==2):
-                if parts[0] not in pyModules:
-                    noExtension=os.path.splitext(f)[0]
-                    msg+= '\t\t<LI><A href="'+f+'">'+noExtension+'</A>\n'
-        msg += "\t</UL>\n"
-        
-        msg += "\t<h2>Modules</h2>\n"
+        pyModules = sorted({ noExtension.split(".")[0] for f, noExtension in names if "." in noExtension })
+        logging.debug("Python modules %s",pyModules)
+        
+        parts = [
+            "<!DOCTYPE html><html>\n<body>\n",
+            "\t<h1>IAS python API</h1>\n",
+            "\t<h2>Scripts</h2>\n",
+            "\t<UL>\n"]
+        
+        for f, noExtension in names:
+            if "." not in noExtension and noExtension not in pyModules:
+                parts.append('\t\t<LI><A href="%s">%s</A>\n' % (f,noExtension))
+        parts.append("\t</UL>\n")
+        
+        parts.append("\t<h2>Modules</h2>\n")
         for m in pyModules:
-            msg +="\t\t<h3>"+m+"</h3>\n"
-            msg += "\t\t<UL>\n"
-            for f in htmlFiles:
-                parts = f.split(".")
-                if (parts[0]==m):
-                    noExtension=os.path.splitext(f)[0]
-                    msg+= '\t\t\t<LI><A href="'+f+'">'+noExtension+'</A>\n'
-            msg += "\t\t</UL>\n"
+            parts.append("\t\t<h3>%s</h3>\n" % m)
+            parts.append("\t\t<UL>\n")
+            for f, noExtension in names:
+                if noExtension.split(".")[0]==m:
+                    parts.append('\t\t\t<LI><A href="%s">%s</A>\n' % (f,noExtension))
+            parts.append("\t\t</UL>\n")
         
-        msg+= "</body>\n"
+        parts.append("</body>\n")
         
-        text_file = open(folder+"/index.html", "w")
-        text_file.write(msg)
-        text_file.close()
+        with open(folder+"/index.html", "w") as text_file:
+            text_file.write("".join(parts))
         
         logging.info("%s/index.html written",folder)
     
+    def writeDoc(self,modName):
+        """
+        Write the HTML documentation of the passed module
+        in the destination folder
+        
+        It is what pydoc.writedoc does, but writing the file in the
+        destination folder instead of the current directory
+        
+        @param modName: the name of the module
+        @return: True if the documentation has been written,
+                 False if the module could not be imported
+        """
+        try:
+            obj, name = pydoc.resolve(modName)
+        except (pydoc.ErrorDuringImport, ImportError) as e:
+            print(e)
+            return False
+        page = pydoc.html.page(pydoc.describe(obj), pydoc.html.document(obj, name))
+        with open(os.path.join(self.dstFolder,name+".html"), "w", encoding="utf-8") as htmlFile:
+            htmlFile.write(page)
+        print("wrote", name+".html")
+        return True
+    
+    def buildPydocsInFolder(self,folder):
+        """
+        Build the pydocs of the python sources in the passed folder
+        in the destination folder
+        
+        The documentation is generated by pydoc in this process
+        
+        @param folder: the folder with python sources
+        @return: 0 if the documentation of all the modules has been written,
+                 1 otherwise
+        """
+        logging.info("Generating pydoc in %s",folder)
+        ret = 0
+        sys.path.insert(0, folder)
+        try:
+            # Send the output of pydoc and of the imported modules to outFile
+            with redirect_stdout(self.outFile):
+                for importer, modName, isPkg in pkgutil.walk_packages([folder], onerror=lambda name: None):
+                    if not self.writeDoc(modName):
+                        ret = 1
+        finally:
+            sys.path.remove(folder)
+        return ret
+    
     def buildPydocs(self):
         """
         Build the pydocs 
         
-        Generation of pydocs is delegated to pydoc executable
+        Generation of pydocs is delegated to pydoc
         
-        @return: the code returned by calling pydoc
+        @return: 0 if pydoc succeeded for all the folders,
+                 1 otherwise
         """
         
         folders = self.getSrcPaths(self.srcFolder, False,"python",".py")
         
-        logging.info("Folders %s",folders)
+        logging.debug("Folders %s",folders)
         logging.info("SourceFolder %s",self.srcFolder)
-                   
+        
+        ret = 0
         for folder in folders:
-            logging.info("Generating pydoc in %s",folder)
-            
-            oldWD = os.getcwd()
-            logging.info("Changing folder to %s",folder)
-            os.chdir(folder)
-            cmd =["pydoc"]
-            cmd.append("-w")
-            cmd.append("./")
-            ret = call(cmd,stdout=self.outFile,stderr=self.outFile)
-            
-            logging.info("Moving htmls to %s",self.dstFolder)
-            files = os.listdir(".")
-            for f in files:
-                if (f.endswith(".html")):
-                    shutil.move(f, self.dstFolder)
-            logging.info("Changing folder back to %s",oldWD)
-            os.chdir(oldWD)
+            if self.buildPydocsInFolder(folder)!=0:
+                ret = 1
         
         self.buildIndex(self.dstFolder)
         return ret
-        
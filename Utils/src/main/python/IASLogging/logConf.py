@@ -1,14 +1,28 @@
 import logging
 import sys
 import os, errno
-import datetime
+import time
 
+# The logging levels that can be passed to initLogging
+LEVELS = { 'debug':logging.DEBUG,
+        'info':logging.INFO,
+        'warning':logging.WARNING,
+        'error':logging.ERROR,
+        'critical':logging.CRITICAL,
+        }
 
 class Log(object):
   @staticmethod
   def initLogging (nameFile,stdoutLevel='info',consoleLevel='info'):
-    #take the path for logs folder inside $IAS_ROOT
+    cleanedFileName = os.path.basename(nameFile)
+
+    # Each tool has its own logger: if already initialized
+    # the handlers are not added again
+    logger = logging.getLogger(cleanedFileName)
+    if logger.handlers:
+        return logger
 
+    #take the path for logs folder inside $IAS_ROOT
     logPath=os.environ["IAS_LOGS_FOLDER"]
     #If the file doesn't exist it's created
     try:
@@ -16,22 +30,13 @@ class Log(object):
     except OSError as e:
         if e.errno != errno.EEXIST:
          raise
-    cleanedFileName = nameFile.split(os.sep)[len(nameFile.split(os.sep))-1]
     #Format of the data for filename
-    now = datetime.datetime.utcnow().strftime('%Y-%m-%d_%H:%M:%S.%f')[:-3]
-    LEVELS = { 'debug':logging.DEBUG,
-            'info':logging.INFO,
-            'warning':logging.WARNING,
-            'error':logging.ERROR,
-            'critical':logging.CRITICAL,
-            }
-    stdLevel_name = stdoutLevel
-    consoleLevel= consoleLevel
-    stdLevel = LEVELS.get(stdLevel_name, logging.NOTSET)
+    nowSecs = time.time()
+    now = "%s.%03d" % (time.strftime('%Y-%m-%d_%H:%M:%S', time.gmtime(nowSecs)), int(nowSecs*1000)%1000)
+    stdLevel = LEVELS.get(stdoutLevel, logging.NOTSET)
     consoleLevel = LEVELS.get(consoleLevel, logging.NOTSET)
-    file=("{0}/{1}.log".format(logPath, str(cleanedFileName)+str(now)))
+    file=("{0}/{1}.log".format(logPath, cleanedFileName+now))
 
-    logger = logging.getLogger(__name__)
     logger.setLevel(logging.INFO)
     # create file handler which logs even debug messages
     fh = logging.FileHandler(file)
@@ -0,0 +1,227 @@
+'''
+The IAS daemon runs IAS tools on behalf of iasRun.
+
+The daemon keeps the python modules needed by iasRun already loaded:
+iasRun sends its command line to the daemon through a UNIX socket
+and the daemon runs the tool in a process forked from itself,
+saving the startup of the python interpreter and the loading of the modules.
+
+The tool runs with the stdin, stdout and stderr, the environment and the
+working directory of iasRun; the signals received by iasRun are forwarded
+to the tool and its exit code is returned to iasRun.
+
+The daemon is optional: if it is not running, iasRun runs the tool itself.
+
+Created on Oct 15, 2026
+'''
+
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+from threading import Thread
+
+# The name of the UNIX socket of the daemon
+SOCKET_NAME = "ias.sock"
+
+# The reply of the daemon to a request it does not serve
+REFUSED = b"REFUSED"
+
+# The signals that iasRun forwards to the tool run by the daemon
+FORWARDED_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGHUP)
+
+def daemonSocketPath():
+    """
+    The socket is created in the private runtime folder
+    of the user (XDG_RUNTIME_DIR) so that it can be accessed only
+    by the user who started the daemon
+
+    @return: the path of the UNIX socket of the daemon
+             or None if XDG_RUNTIME_DIR is not defined
+    """
+    folder = os.environ.get("XDG_RUNTIME_DIR")
+    if not folder:
+        return None
+    return os.path.join(folder, SOCKET_NAME)
+
+def loadIasRun():
+    """
+    Load the iasRun script as a module
+
+    @return: the iasRun module
+    """
+    import importlib.machinery
+    import importlib.util
+    import shutil
+    scriptPath = shutil.which("iasRun")
+    if scriptPath is None:
+        raise FileNotFoundError("iasRun not found in PATH")
+    loader = importlib.machinery.SourceFileLoader("iasRun", scriptPath)
+    spec = importlib.util.spec_from_loader("iasRun", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+def runInDaemon(argv):
+    """
+    Run a tool in the IAS daemon, if it is running
+
+    @param argv: the command line parameters of iasRun
+    @return: the exit code of the tool or None if the daemon
+             is not running or refused to run the tool
+    """
+    # Passing the file descriptors needs python 3.9
+    if not hasattr(socket, "send_fds"):
+        return None
+    path = daemonSocketPath()
+    if path is None or not os.path.exists(path) or os.stat(path).st_uid!=os.getuid():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        # Stale socket: the daemon is not running
+        sock.close()
+        return None
+
+    with sock:
+        request = {"argv": argv, "env": dict(os.environ), "cwd": os.getcwd()}
+        socket.send_fds(sock, [b"F"], [0, 1, 2])
+        sock.sendall(json.dumps(request).encode("utf-8")+b"\n")
+
+        # Forward the signals to the tool
+        def forward(signum, frame):
+            sock.sendall(b"%d\n" % signum)
+        oldHandlers = [(sig, signal.signal(sig, forward)) for sig in FORWARDED_SIGNALS]
+        try:
+            reply = sock.makefile("rb").readline().strip()
+        finally:
+            for sig, handler in oldHandlers:
+                signal.signal(sig, handler)
+
+    if reply==REFUSED:
+        return None
+    if not reply:
+        # The daemon terminated before replying
+        return 1
+    return int(reply)
+
+class IasDaemon(object):
+    '''
+    The daemon that runs IAS tools on behalf of iasRun.
+
+    Each request is served by a process forked from the daemon.
+    '''
+
+    def __init__(self, runFunction, path, logger=None):
+        '''
+        Constructor
+
+        The daemon does not log with the root logger: its handlers
+        would be inherited by the tools and print their logs twice
+
+        @param runFunction: the function that runs a tool: it gets
+                            the command line parameters of iasRun and
+                            returns the exit code (iasRun.main)
+        @param path: the path of the UNIX socket
+        @param logger: the logger of the daemon
+        '''
+        self.runFunction = runFunction
+        self.path = path
+        self.logger = logger if logger is not None else logging.getLogger(__file__)
+
+    def serve(self):
+        '''
+        Serve the requests until the daemon is terminated
+        '''
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        os.chmod(self.path, 0o600)
+        server.listen()
+        self.logger.info("IAS daemon listening on %s", self.path)
+
+        # Let the kernel reap the terminated children
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        try:
+            while True:
+                conn = server.accept()[0]
+                if os.fork()==0:
+                    server.close()
+                    exitCode = 1
+                    try:
+                        exitCode = self._serveRequest(conn)
+                    finally:
+                        os._exit(exitCode)
+                conn.close()
+        except KeyboardInterrupt:
+            self.logger.info("IAS daemon terminated")
+        finally:
+            server.close()
+            os.unlink(self.path)
+
+    def _serveRequest(self, conn):
+        '''
+        Run the tool requested by iasRun
+
+        This method runs in the process forked to serve the request
+
+        @param conn: the connection with iasRun
+        @return: the exit code of the tool
+        '''
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+        fds = socket.recv_fds(conn, 1, 3)[1]
+        reader = conn.makefile("rb")
+        request = json.loads(reader.readline())
+
+        # The modules loaded by the daemon read the IAS environment
+        # when imported: tools of another IAS installation cannot be run
+        if len(fds)!=3 or request["env"].get("IAS_ROOT")!=os.environ.get("IAS_ROOT"):
+            conn.sendall(REFUSED+b"\n")
+            return 1
+
+        # The process group of the tool receives the signals forwarded by iasRun
+        os.setpgid(0, 0)
+        # The tool is interrupted by SIGINT as if it was run by iasRun
+        # while the other signals are only for its children
+        for sig in FORWARDED_SIGNALS:
+            signal.signal(sig, lambda signum, frame: None)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        Thread(target=self._forwardSignals, args=(reader,), daemon=True).start()
+
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+
+        try:
+            exitCode = self.runFunction(request["argv"])
+        except KeyboardInterrupt:
+            exitCode = 128+signal.SIGINT
+        except SystemExit as e:
+            if e.code is None:
+                exitCode = 0
+            elif isinstance(e.code, int):
+                exitCode = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                exitCode = 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+        conn.sendall(b"%d\n" % (exitCode & 0xFF))
+        return exitCode
+
+    def _forwardSignals(self, reader):
+        '''
+        Send to the process group the signals forwarded by iasRun
+
+        @param reader: the reader of the connection with iasRun
+        '''
+        for line in reader:
+            os.killpg(0, int(line))
@@ -8,14 +8,9 @@ Created on Sep 26, 2016
 import argparse
 import os
 import socket
-from subprocess import call
 
 import sys
 
-from IASLogging.logConf import Log
-from IASTools.CommonDefs import CommonDefs
-from IASTools.FileSupport import FileSupport
-
 
 def setProps(propsDict,className,logFileNameId):
     """
@@ -50,12 +45,13 @@ def setProps(propsDict,className,logFileNameId):
 
     # Append the log identifier if it has been passed in the command line
     if len(logFileNameId.strip())>0:
-        logFileName = logFileName+"-"+logFileNameId.strip()
+        logFileName = f"{logFileName}-{logFileNameId.strip()}"
     propsDict["ias.logs.filename"]= logFileName
 
     propsDict["ias.config.folder"]=os.environ["IAS_CONFIG_FOLDER"]
 
     # Set the config file for sl4j (defined in Logging)
+    from IASTools.FileSupport import FileSupport
     logbackConfigFileName="logback.xml"
     fs = FileSupport(logbackConfigFileName,"config")
     try:
@@ -102,16 +98,7 @@ def formatProps(propsDict):
     @param propsDict: A dictionary of properties in the form name:value
     @return A list of java/scala properties
     """
-    if len(propsDict)==0:
-        return []
-
-    ret = []
-
-    keys = list(propsDict.keys())
-    for key in keys:
-        propStr = "-D"+key+"="+propsDict[key]
-        ret.append(propStr)
-    return ret
+    return [f"-D{key}={value}" for key, value in propsDict.items()]
 
 def javaOpts():
     """
@@ -133,12 +120,38 @@ def javaOpts():
         # JAVA_OPTS environment variable not defined
         return []
 
-if __name__ == '__main__':
+def runCommand(cmd,env):
     """
-    Run a java or scala tool.
+    Run the passed command and wait for its termination.
+
+    The process is spawned with posix_spawnp, where available,
+    that does not duplicate the memory of this process as fork does
+
+    @param cmd: the command to run (list of strings)
+    @param env: the environment of the command (dictionary)
+    @return: the exit code of the command or, as the shell does,
+             128+N if the command has been killed by the signal N
+    """
+    if not hasattr(os, "posix_spawnp"):
+        from subprocess import call
+        exitCode = call(cmd,env=env)
+        # call returns -N if the command has been killed by the signal N
+        return 128-exitCode if exitCode<0 else exitCode
+
+    pid = os.posix_spawnp(cmd[0], cmd, env)
+    status = os.waitpid(pid, 0)[1]
+    if os.WIFEXITED(status):
+        return os.WEXITSTATUS(status)
+    return 128+os.WTERMSIG(status)
+
+def buildParser():
     """
+    Build the parser of the command line
 
-    parser = argparse.ArgumentParser(description='Run a java or scala program.')
+    @return: the ArgumentParser to parse the command line of iasRun
+    """
+    # prog is set because the parser is also built when iasd loads this module
+    parser = argparse.ArgumentParser(prog='iasRun', description='Run a java or scala program.')
     parser.add_argument(
                         '-l',
                         '--language',
@@ -194,7 +207,28 @@ if __name__ == '__main__':
     parser.add_argument('className', help='The name of the class to run the program')
     parser.add_argument('params', nargs=argparse.REMAINDER,
                     help='Command line parameters')
-    args = parser.parse_args()
+    return parser
+
+# The parser of the command line, built only once when the module is loaded
+# so that it can be reused to run more tools from the same process
+PARSER = buildParser()
+
+def main(argv):
+    """
+    Run a java or scala tool.
+
+    @param argv: the command line parameters (without the name of the program)
+    @return: the exit code of the tool
+    """
+    global logger
+
+    args = PARSER.parse_args(argv)
+
+    # Imported only after parsing the command line: printing the help
+    # or rejecting an invalid command line does not pay for them
+    from IASLogging.logConf import Log
+    from IASTools.CommonDefs import CommonDefs
+    from IASTools.FileSupport import FileSupport
 
     #Start the logger with param define by the user.
     stdoutLevel=args.levelStdOut
@@ -311,18 +345,28 @@ if __name__ == '__main__':
             logger.info()
 
     if verbose:
-        arrowDown =  chr(8595)
-        delimiter = ""
-        for t in range(16):
-            delimiter = delimiter + arrowDown
+        delimiter = chr(8595)*16
 
         logger.info("\n %s %s output %s",delimiter,args.className,delimiter)
 
-    call(cmd)
+    exitCode = runCommand(cmd,d)
 
     if verbose:
-        arrowUp =  chr(8593)
-        delimiter = ""
-        for t in range(17):
-            delimiter = delimiter + arrowUp
+        delimiter = chr(8593)*17
         logger.info("%s %s done %s",delimiter,args.className,delimiter)
+    return exitCode
+
+if __name__ == '__main__':
+    # Delegate to the IAS daemon, if it is running,
+    # otherwise run the tool from this process
+    #
+    # The client of the daemon is imported only if the socket of the
+    # daemon (IasDaemon.SOCKET_NAME) exists
+    exitCode = None
+    runtimeFolder = os.environ.get("XDG_RUNTIME_DIR")
+    if runtimeFolder and os.path.exists(os.path.join(runtimeFolder, "ias.sock")):
+        from IASTools.IasDaemon import runInDaemon
+        exitCode = runInDaemon(sys.argv[1:])
+    if exitCode is None:
+        exitCode = main(sys.argv[1:])
+    sys.exit(exitCode)
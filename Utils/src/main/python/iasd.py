@@ -0,0 +1,37 @@
+#! /usr/bin/env python
+'''
+Runs the IAS daemon that serves the requests of iasRun.
+
+While the daemon is running, iasRun delegates the running of the tools
+to the daemon that has the python modules already loaded
+'''
+import argparse
+import socket
+import sys
+
+from IASLogging.logConf import Log
+from IASTools.IasDaemon import IasDaemon, daemonSocketPath, loadIasRun
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Run the IAS daemon: iasRun delegates the running of java and scala tools to the daemon.')
+    parser.parse_args()
+
+    if not hasattr(socket, "recv_fds"):
+        print("The IAS daemon needs python 3.9 or newer", file=sys.stderr)
+        sys.exit(1)
+
+    path = daemonSocketPath()
+    if path is None:
+        print("XDG_RUNTIME_DIR not defined: cannot start the IAS daemon", file=sys.stderr)
+        sys.exit(1)
+
+    logger = Log.initLogging(__file__)
+
+    # Load the modules used by iasRun so that they are
+    # already available in the processes forked to run the tools
+    import IASTools.CommonDefs
+    import IASTools.FileSupport
+    iasRun = loadIasRun()
+
+    IasDaemon(iasRun.main, path, logger).serve()
@@ -0,0 +1,160 @@
+#! /usr/bin/env python
+'''
+Test the IAS daemon with a stub of iasRun.main and with iasRun
+
+Created on Oct 15, 2026
+'''
+
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+import unittest
+
+from IASTools.IasDaemon import IasDaemon, runInDaemon, daemonSocketPath, loadIasRun
+
+from IASLogging.logConf import Log
+
+def stubMain(argv):
+    '''
+    Stub of iasRun.main: the exit code is the first parameter
+    or SystemExit is raised if the first parameter is "exit"
+
+    @param argv: the command line parameters
+    @return: the exit code
+    '''
+    if argv[0]=="exit":
+        sys.exit(int(argv[1]))
+    return int(argv[0])
+
+@unittest.skipUnless(hasattr(socket, "send_fds"), "The IAS daemon needs python 3.9")
+class TestIasDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpFolder = tempfile.TemporaryDirectory()
+        self.oldEnv = dict(os.environ)
+        os.environ["XDG_RUNTIME_DIR"] = self.tmpFolder.name
+        os.environ["IAS_ROOT"] = "/opt/IasRoot"
+        self.path = daemonSocketPath()
+        self.daemonPid = None
+
+    def tearDown(self):
+        if self.daemonPid is not None:
+            os.kill(self.daemonPid, signal.SIGINT)
+            os.waitpid(self.daemonPid, 0)
+        os.environ.clear()
+        os.environ.update(self.oldEnv)
+        self.tmpFolder.cleanup()
+
+    def startDaemon(self, runFunction=stubMain):
+        '''
+        Run the daemon in a child process and wait until it accepts connections
+
+        @param runFunction: the function that runs the tools
+        '''
+        self.daemonPid = os.fork()
+        if self.daemonPid==0:
+            exitCode = 0
+            try:
+                IasDaemon(runFunction, self.path).serve()
+            except:
+                exitCode = 1
+            finally:
+                os._exit(exitCode)
+
+        timeout = time.monotonic()+10
+        while time.monotonic()<timeout:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                try:
+                    sock.connect(self.path)
+                    return
+                except OSError:
+                    time.sleep(0.05)
+        self.fail("The daemon did not start")
+
+    def runRedirected(self, argv):
+        '''
+        Run a tool in the daemon with stdout and stderr redirected to files
+
+        @param argv: the command line parameters of iasRun
+        @return: the exit code, the stdout and the stderr of the tool
+        '''
+        sys.stdout.flush()
+        sys.stderr.flush()
+        with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+            savedFds = [os.dup(1), os.dup(2)]
+            os.dup2(out.fileno(), 1)
+            os.dup2(err.fileno(), 2)
+            try:
+                exitCode = runInDaemon(argv)
+            finally:
+                for target, fd in enumerate(savedFds, 1):
+                    os.dup2(fd, target)
+                    os.close(fd)
+            out.seek(0)
+            err.seek(0)
+            return exitCode, out.read().decode(), err.read().decode()
+
+    def testNoDaemon(self):
+        '''
+        runInDaemon returns None if the daemon is not running
+        '''
+        self.assertIsNone(runInDaemon(["0"]))
+
+    def testExitCode(self):
+        '''
+        The exit code of the tool is returned by runInDaemon
+        '''
+        self.startDaemon()
+        self.assertEqual(runInDaemon(["0"]), 0)
+        self.assertEqual(runInDaemon(["3"]), 3)
+        self.assertEqual(runInDaemon(["exit", "5"]), 5)
+
+    def testRefusedIasRoot(self):
+        '''
+        The daemon refuses to run the tools of another IAS installation
+        '''
+        self.startDaemon()
+        os.environ["IAS_ROOT"] = "/opt/AnotherIasRoot"
+        self.assertIsNone(runInDaemon(["0"]))
+
+    def testIasRunHelp(self):
+        '''
+        The help and the errors of iasRun run by the daemon
+        report the name of iasRun
+        '''
+        self.startDaemon(loadIasRun().main)
+        exitCode, out, err = self.runRedirected(["-h"])
+        self.assertEqual(exitCode, 0)
+        self.assertTrue(out.startswith("usage: iasRun "), out)
+
+        exitCode, out, err = self.runRedirected([])
+        self.assertEqual(exitCode, 2)
+        self.assertIn("iasRun: error:", err)
+
+    def testIasRunLogs(self):
+        '''
+        The logs of iasRun run by the daemon are printed only once
+        '''
+        self.startDaemon(loadIasRun().main)
+        os.environ.pop("SCALA_HOME", None)
+        exitCode, out, err = self.runRedirected(["-l", "j", "org.eso.ias.NotExistingClass"])
+        self.assertNotEqual(exitCode, 0)
+        self.assertEqual(err.count("Some setting missing in IAS environment"), 1, err)
+
+    def testStaleSocket(self):
+        '''
+        runInDaemon returns None if the socket exists but the
+        daemon is not listening
+        '''
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(self.path)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertIsNone(runInDaemon(["0"]))
+
+if __name__ == '__main__':
+    logger=Log.initLogging(__file__)
+    logger.info("Start main")
+    unittest.main()
@@ -1,3 +1,6 @@
 #!/usr/bin/bash
+# Stop at the first failing test and return its exit code
+set -e
 testCreateModule
+testIasDaemon
 iasRun -l s org.scalatest.run org.eso.ias.utils.test.ISO8601Test